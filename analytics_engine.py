@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+
+
+class _GoalAggregate:
+    """Running sums over one goal's progress log"""
+
+    __slots__ = ("ids", "hours", "confidence", "count")
+
+    def __init__(self):
+        self.ids = set()
+        self.hours = 0.0
+        self.confidence = 0.0
+        self.count = 0
+
+    def add(self, entries: List[Dict[str, Any]]):
+        """Fold entries into the sums with one array operation per column"""
+        if not entries:
+            return
+        count = len(entries)
+        hours = np.fromiter((entry.get("hours_studied") or 0.0 for entry in entries), dtype=np.float64, count=count)
+        confidence = np.fromiter((entry.get("confidence_level") or 0 for entry in entries), dtype=np.float64, count=count)
+        self.hours += float(hours.sum())
+        self.confidence += float(confidence.sum())
+        self.count += count
+        self.ids.update(entry["id"] for entry in entries if entry.get("id") is not None)
+
+
+class AnalyticsEngine:
+    """Study hours and average confidence kept up to date from progress logs the pages already fetched
+
+    A full sync rebuilds a goal's sums, so edited or deleted entries are
+    reflected; incremental syncs and newly logged entries only add what was
+    not seen before (deduplicated by entry id).
+    """
+
+    def __init__(self, max_goals: int = 256):
+        self.max_goals = max_goals
+        self._goals: "OrderedDict[Hashable, _GoalAggregate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def sync(self, key: Hashable, entries: List[Dict[str, Any]], incremental: bool):
+        """Fold in a fetched progress log, keyed by (token, goal_id): a new page or the full history"""
+        with self._lock:
+            aggregate = self._goals.get(key)
+            if aggregate is None or not incremental:
+                aggregate = self._goals[key] = _GoalAggregate()
+            aggregate.add([entry for entry in entries if entry.get("id") not in aggregate.ids])
+            self._goals.move_to_end(key)
+            while len(self._goals) > self.max_goals:
+                self._goals.popitem(last=False)
+
+    def record(self, key: Hashable, entry: Dict[str, Any]) -> bool:
+        """Fold in one entry the user just logged; False if the goal's log is not held locally"""
+        with self._lock:
+            aggregate = self._goals.get(key)
+            if aggregate is None:
+                return False
+            if entry.get("id") is None:
+                # A later sync could not recognize it, so wait for a full one instead
+                del self._goals[key]
+                return False
+            if entry["id"] not in aggregate.ids:
+                aggregate.add([entry])
+            return True
+
+    def aggregates(self, token: str, goal_ids: Iterable[int]) -> Optional[Dict[str, Any]]:
+        """total_study_hours and average_confidence, or None unless every goal's log is held locally"""
+        with self._lock:
+            parts = [self._goals.get((token, goal_id)) for goal_id in goal_ids]
+            if any(part is None for part in parts):
+                return None
+            hours = sum(part.hours for part in parts)
+            confidence = sum(part.confidence for part in parts)
+            count = sum(part.count for part in parts)
+        return {
+            "total_study_hours": hours,
+            "average_confidence": confidence / count if count else 0.0
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Get how many goals and entries are aggregated locally"""
+        with self._lock:
+            return {
+                "goals": len(self._goals),
+                "entries": sum(part.count for part in self._goals.values())
+            }
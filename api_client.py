@@ -1,6 +1,7 @@
 import requests
 from typing import Dict, Any, Optional
 from config import API_BASE_URL
+from http_transport import get_session, decode_body
 
 
 class APIClient:
@@ -8,14 +9,15 @@ class APIClient:
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url
+        self.session = get_session()
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
         """Make HTTP request to API"""
         try:
             url = f"{self.base_url}{endpoint}"
-            response = requests.request(method, url, **kwargs)
+            response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json()
+            return decode_body(response)
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
             return None
@@ -1,11 +1,22 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
-from config import PAGE_CONFIG, CUSTOM_CSS, LEARNING_CATEGORIES, COLORS, DEFAULT_STUDY_HOURS, DEFAULT_TARGET_DAYS
+from config import (
+    PAGE_CONFIG, CUSTOM_CSS, LEARNING_CATEGORIES, COLORS, DEFAULT_STUDY_HOURS, DEFAULT_TARGET_DAYS, CHAT_STREAMING,
+    METRICS_PORT, METRICS_EXPORT_PATH, METRICS_EXPORT_INTERVAL, PERFORMANCE_PAGE_ENABLED,
+    RENDER_PROFILE, RENDER_PROFILE_DIR, RENDER_PROFILE_MAX_FILES,
+    CHAT_HISTORY_PAGE_SIZE, RENDER_DEADLINE_SECONDS, GOALS_PAGE_SIZE
+)
 from auth_manager import AuthManager
+from charts import goal_progress_chart, progress_chart
+from circuit_breaker import breaker, OPEN, HALF_OPEN
+from deadline import render_deadline
 from goals_manager import GoalsManager
+from metrics import registry, start_exporters
+from page_memo import memoized, page_memo_stats
+from profiler import profiled, render_trace, span
+from session_state import SessionStateManager
+from warmup import warm_up
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -15,12 +26,16 @@ load_dotenv()
 auth_manager = AuthManager()
 goals_manager = GoalsManager()
 
+# Start Prometheus exporters (no-op after the first run in this process)
+start_exporters(METRICS_PORT, METRICS_EXPORT_PATH or None, METRICS_EXPORT_INTERVAL)
+
 # Page configuration
 st.set_page_config(**PAGE_CONFIG)
 
 # Apply custom CSS
 st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
+@profiled
 def render_header():
     """Render the main header"""
     st.markdown("""
@@ -30,6 +45,7 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
+@profiled
 def render_auth_forms():
     """Render authentication forms"""
     tab1, tab2 = st.tabs(["Login", "Register"])
@@ -46,6 +62,9 @@ def render_auth_forms():
                     result = auth_manager.login_user(email, password)
                     if result["success"]:
                         st.session_state.token = result["data"]["access_token"]
+                        st.session_state.pop("user", None)
+                        # Start filling the caches the first pages read while this script reruns
+                        warm_up(st.session_state.token, auth_manager, goals_manager)
                         st.success("Login successful!")
                         st.rerun()
                     else:
@@ -76,6 +95,7 @@ def render_auth_forms():
                 else:
                     st.error("Please fill in all fields")
 
+@profiled
 def render_sidebar():
     """Render the sidebar with navigation"""
     st.sidebar.title("🎯 Navigation")
@@ -84,10 +104,16 @@ def render_sidebar():
         user = st.session_state.get("user", {})
         st.sidebar.markdown(f"**Welcome, {user.get('full_name', 'User')}!**")
         
-        page = st.sidebar.selectbox(
-            "Choose a page:",
-            ["Dashboard", "My Goals", "Create Goal", "Daily Plans", "Progress Tracking", "AI Chat", "Analytics", "Settings"]
-        )
+        pages = ["Dashboard", "My Goals", "Create Goal", "Daily Plans", "Progress Tracking", "AI Chat", "Analytics", "Settings"]
+        if PERFORMANCE_PAGE_ENABLED or user.get("is_admin") or user.get("role") == "admin":
+            pages.append("Performance")
+        
+        page = st.sidebar.selectbox("Choose a page:", pages)
+        
+        if breaker is not None and breaker.state == OPEN:
+            st.sidebar.error("🔌 Server unavailable. Requests are paused and will resume automatically.")
+        elif breaker is not None and breaker.state == HALF_OPEN:
+            st.sidebar.warning("🔌 Server recovering. Some requests may still fail.")
         
         if st.sidebar.button("Logout"):
             auth_manager.logout()
@@ -97,12 +123,19 @@ def render_sidebar():
         st.sidebar.markdown("Please login to access your learning dashboard.")
         return None
 
+def _load_analytics():
+    """Get analytics (with the goals list fetched alongside), reused across reruns until the next write"""
+    return memoized("analytics", (), lambda: goals_manager.fetch_concurrently({
+        "analytics": goals_manager.get_analytics,
+        "goals": goals_manager.get_user_goals
+    })["analytics"])
+
+@profiled
 def render_dashboard():
     """Render the main dashboard"""
     st.header("📊 Your Learning Dashboard")
     
-    # Get user analytics
-    analytics_result = goals_manager.get_analytics()
+    analytics_result = _load_analytics()
     
     if analytics_result["success"]:
         analytics = analytics_result["data"]
@@ -127,29 +160,52 @@ def render_dashboard():
         for insight in analytics["insights"]:
             st.info(insight)
         
-        # Display recent goals
-        goals_result = goals_manager.get_user_goals()
+        # Display recent goals (the goals list was fetched above, so this is a cache hit)
+        goals_result = goals_manager.get_goal_store()
         if goals_result["success"]:
-            goals = goals_result["data"]
-            if goals:
+            store = goals_result["data"]
+            if store:
                 st.subheader("🎯 Your Goals")
-                for goal in goals[:3]:  # Show first 3 goals
+                for goal_id in store.ids[:3]:  # Show first 3 goals
+                    goal = store.get(goal_id)
                     with st.expander(f"{goal['title']} - {goal['category']}"):
                         st.write(f"**Description:** {goal['description']}")
                         st.write(f"**Progress:** Day {goal['current_day']} of {goal['target_days']}")
-                        progress = (goal['current_day'] / goal['target_days']) * 100
-                        st.progress(progress / 100)
+                        st.progress(store.progress_ratio(goal_id))
     else:
         st.warning("Unable to load analytics. Please try again.")
 
+def _set_goals_page(page_number: int):
+    st.session_state.goals_page = max(0, page_number)
+
+def _reset_goals_page():
+    st.session_state.goals_page = 0
+
+@profiled
 def render_goals():
     """Render goals management page"""
     st.header("🎯 My Learning Goals")
     
-    goals_result = goals_manager.get_user_goals()
+    # Search and filter; changing either starts again from the first page
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search = st.text_input("Search goals", key="goals_search", on_change=_reset_goals_page,
+                               placeholder="Title or description")
+    with col2:
+        category = st.selectbox(
+            "Category",
+            options=[""] + list(LEARNING_CATEGORIES.keys()),
+            format_func=lambda x: LEARNING_CATEGORIES[x]["name"] if x else "All categories",
+            key="goals_category",
+            on_change=_reset_goals_page
+        )
+    
+    page_number = st.session_state.get("goals_page", 0)
+    goals_result = goals_manager.get_goals_page(GOALS_PAGE_SIZE, page_number * GOALS_PAGE_SIZE, search.strip(), category)
     
     if goals_result["success"]:
-        goals = goals_result["data"]
+        goals = goals_result["data"]["items"]
+        total = goals_result["data"]["total"]
         
         if goals:
             for goal in goals:
@@ -181,11 +237,31 @@ def render_goals():
                             st.session_state.selected_goal = goal['id']
                             st.session_state.current_page = "AI Chat"
                             st.rerun()
+            
+            # Pagination
+            last_page = max(0, (total - 1) // GOALS_PAGE_SIZE)
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                st.button("← Previous", key="goals_prev", disabled=page_number == 0,
+                          on_click=_set_goals_page, args=(page_number - 1,))
+            with col2:
+                first = page_number * GOALS_PAGE_SIZE + 1
+                st.caption(f"Showing {first}–{first + len(goals) - 1} of {total} goals")
+            with col3:
+                st.button("Next →", key="goals_next", disabled=page_number >= last_page,
+                          on_click=_set_goals_page, args=(page_number + 1,))
+        elif search or category:
+            st.info("No goals match your search.")
+        elif page_number > 0:
+            # The page emptied (e.g. after deletions elsewhere); go back to the start
+            _reset_goals_page()
+            st.rerun()
         else:
             st.info("You haven't created any goals yet. Create your first learning goal!")
     else:
         st.error("Unable to load goals. Please try again.")
 
+@profiled
 def render_create_goal():
     """Render goal creation page"""
     st.header("🎯 Create New Learning Goal")
@@ -215,95 +291,112 @@ def render_create_goal():
             else:
                 st.error("Please fill in all required fields")
 
+@profiled
+def render_daily_plan(plan, selected_day):
+    """Render a generated daily plan"""
+    st.subheader(f"📋 Day {selected_day} Plan")
+    
+    # Topics
+    st.write("**Topics to Cover:**")
+    for topic in plan["topics"]:
+        st.write(f"• {topic}")
+    
+    # Learning Objectives
+    st.write("**Learning Objectives:**")
+    for topic, objectives in plan["learning_objectives"].items():
+        st.write(f"**{topic}:**")
+        for objective in objectives:
+            st.write(f"  • {objective}")
+    
+    # Practice Problems
+    st.write("**Practice Activities:**")
+    for problem in plan["practice_problems"]:
+        difficulty = problem.get("difficulty_level", "Medium")
+        description = problem.get("description", "Practice activity")
+        
+        if difficulty == "Easy":
+            st.write(f"🟢 {description}")
+        elif difficulty == "Medium":
+            st.write(f"🟡 {description}")
+        else:
+            st.write(f"🔴 {description}")
+    
+    # Resources
+    st.write("**Recommended Resources:**")
+    for resource in plan["resources"]:
+        st.write(f"• {resource}")
+    
+    # Summary
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Estimated Hours", f"{plan['estimated_hours']:.1f}")
+    with col2:
+        st.metric("Difficulty", plan["difficulty_level"])
+    with col3:
+        st.metric("Focus Areas", len(plan["focus_areas"]))
+
+@profiled
 def render_daily_plans():
     """Render daily plans page"""
     st.header("📅 Daily Learning Plans")
     
-    goals_result = goals_manager.get_user_goals()
+    goals_result = goals_manager.get_goal_store()
     
     if goals_result["success"]:
-        goals = goals_result["data"]
+        store = goals_result["data"]
         
-        if goals:
+        if store:
             # Goal selection
             selected_goal_id = st.selectbox(
                 "Select a goal:",
-                options=[goal["id"] for goal in goals],
-                format_func=lambda x: next(goal["title"] for goal in goals if goal["id"] == x)
+                options=store.ids,
+                format_func=store.title
             )
             
-            # Day selection
-            selected_day = st.slider("Select Day", min_value=1, max_value=30, value=1)
+            # Day selection, starting at the goal's current day (its plan is warmed up after login)
+            max_day = 30
+            current_day = min(max(store.get(selected_goal_id).get("current_day") or 1, 1), max_day)
+            selected_day = st.slider("Select Day", min_value=1, max_value=max_day, value=current_day)
             
-            if st.button("Generate Plan"):
+            # Plans already generated (or prefetched) show up without another click
+            if st.button("Generate Plan") or goals_manager.has_cached_daily_plan(selected_goal_id, selected_day):
                 with st.spinner("Generating your personalized plan..."):
                     plan_result = goals_manager.get_daily_plan(selected_goal_id, selected_day)
-                    
-                    if plan_result["success"]:
-                        plan = plan_result["data"]
-                        
-                        st.subheader(f"📋 Day {selected_day} Plan")
-                        
-                        # Topics
-                        st.write("**Topics to Cover:**")
-                        for topic in plan["topics"]:
-                            st.write(f"• {topic}")
-                        
-                        # Learning Objectives
-                        st.write("**Learning Objectives:**")
-                        for topic, objectives in plan["learning_objectives"].items():
-                            st.write(f"**{topic}:**")
-                            for objective in objectives:
-                                st.write(f"  • {objective}")
-                        
-                        # Practice Problems
-                        st.write("**Practice Activities:**")
-                        for problem in plan["practice_problems"]:
-                            difficulty = problem.get("difficulty_level", "Medium")
-                            description = problem.get("description", "Practice activity")
-                            
-                            if difficulty == "Easy":
-                                st.write(f"🟢 {description}")
-                            elif difficulty == "Medium":
-                                st.write(f"🟡 {description}")
-                            else:
-                                st.write(f"🔴 {description}")
-                        
-                        # Resources
-                        st.write("**Recommended Resources:**")
-                        for resource in plan["resources"]:
-                            st.write(f"• {resource}")
-                        
-                        # Summary
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.metric("Estimated Hours", f"{plan['estimated_hours']:.1f}")
-                        with col2:
-                            st.metric("Difficulty", plan["difficulty_level"])
-                        with col3:
-                            st.metric("Focus Areas", len(plan["focus_areas"]))
-                    else:
-                        st.error(plan_result["error"])
+                
+                if plan_result["success"]:
+                    render_daily_plan(plan_result["data"], selected_day)
+                    goals_manager.prefetch_daily_plans(selected_goal_id, selected_day, max_day=max_day)
+                else:
+                    st.error(plan_result["error"])
         else:
             st.info("Create a goal first to generate daily plans!")
     else:
         st.error("Unable to load goals. Please try again.")
 
+def _load_progress(goal_id):
+    """Get a goal's progress history together with its chart"""
+    result = goals_manager.get_goal_progress(goal_id)
+    if result["success"] and result["data"]:
+        with span("progress chart", "plotly"):
+            result = dict(result, figure=progress_chart(result["data"]))
+    return result
+
+@profiled
 def render_progress_tracking():
     """Render progress tracking page"""
     st.header("📊 Progress Tracking")
     
-    goals_result = goals_manager.get_user_goals()
+    goals_result = goals_manager.get_goal_store()
     
     if goals_result["success"]:
-        goals = goals_result["data"]
+        store = goals_result["data"]
         
-        if goals:
+        if store:
             # Goal selection
             selected_goal_id = st.selectbox(
                 "Select a goal to track:",
-                options=[goal["id"] for goal in goals],
-                format_func=lambda x: next(goal["title"] for goal in goals if goal["id"] == x)
+                options=store.ids,
+                format_func=store.title
             )
             
             # Progress logging form
@@ -325,12 +418,14 @@ def render_progress_tracking():
                 
                 if submit_progress:
                     if topics_covered:
-                        result = goals_manager.log_progress(
+                        result = goals_manager.queue_progress(
                             selected_goal_id, day, topics_covered, 
                             hours_studied, problems_solved, confidence_level, notes
                         )
                         
-                        if result["success"]:
+                        if result["success"] and result.get("queued"):
+                            st.success("Progress saved! It will sync as soon as the server responds.")
+                        elif result["success"]:
                             st.success("Progress logged successfully!")
                             st.info(f"AI Feedback: {result['data']['ai_feedback']}")
                         else:
@@ -338,32 +433,34 @@ def render_progress_tracking():
                     else:
                         st.error("Please select at least one topic covered")
             
+            queue_stats = goals_manager.progress_queue_stats()
+            if queue_stats and queue_stats["pending"]:
+                st.caption(f"⏳ {queue_stats['pending']} progress update(s) waiting to sync")
+
+            failed_progress = goals_manager.failed_progress()
+            if failed_progress:
+                st.warning(f"⚠️ {len(failed_progress)} progress update(s) could not be saved")
+                for entry in failed_progress:
+                    payload = entry["payload"]
+                    col1, col2, col3 = st.columns([4, 1, 1])
+                    col1.write(f"{store.title(payload['goal_id'])}, day {payload['day']}: {entry['error']}")
+                    if col2.button("Retry", key=f"retry_{entry['key']}"):
+                        goals_manager.retry_failed_progress(entry["key"])
+                        st.rerun()
+                    if col3.button("Dismiss", key=f"dismiss_{entry['key']}"):
+                        goals_manager.discard_failed_progress(entry["key"])
+                        st.rerun()
+
             # Show progress history
             st.subheader("Progress History")
-            progress_result = goals_manager.get_goal_progress(selected_goal_id)
+            progress_result = memoized("progress", (selected_goal_id,),
+                                       lambda: _load_progress(selected_goal_id))
             
             if progress_result["success"]:
                 progress_logs = progress_result["data"]
                 
                 if progress_logs:
-                    # Create progress chart
-                    days = [log["day"] for log in progress_logs]
-                    hours = [log["hours_studied"] for log in progress_logs]
-                    confidence = [log["confidence_level"] for log in progress_logs]
-                    
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(x=days, y=hours, name="Study Hours", mode="lines+markers"))
-                    fig.add_trace(go.Scatter(x=days, y=confidence, name="Confidence Level", mode="lines+markers", yaxis="y2"))
-                    
-                    fig.update_layout(
-                        title="Progress Over Time",
-                        xaxis_title="Day",
-                        yaxis_title="Study Hours",
-                        yaxis2=dict(title="Confidence Level", overlaying="y", side="right"),
-                        height=400
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(progress_result["figure"], use_container_width=True)
                 else:
                     st.info("No progress logged yet. Start tracking your progress!")
         else:
@@ -371,21 +468,22 @@ def render_progress_tracking():
     else:
         st.error("Unable to load goals. Please try again.")
 
+@profiled
 def render_ai_chat():
     """Render AI chat page"""
     st.header("🤖 AI Learning Coach")
     
-    goals_result = goals_manager.get_user_goals()
+    goals_result = goals_manager.get_goal_store()
     
     if goals_result["success"]:
-        goals = goals_result["data"]
+        store = goals_result["data"]
         
-        if goals:
+        if store:
             # Goal selection
             selected_goal_id = st.selectbox(
                 "Select a goal for context:",
-                options=[goal["id"] for goal in goals],
-                format_func=lambda x: next(goal["title"] for goal in goals if goal["id"] == x)
+                options=store.ids,
+                format_func=store.title
             )
             
             # Chat interface
@@ -395,28 +493,49 @@ def render_ai_chat():
             </div>
             """, unsafe_allow_html=True)
             
+            render_chat_history()
+            
             # Chat input
             user_message = st.text_input("Your question:", key="chat_input")
             
             if st.button("Send Message"):
                 if user_message:
-                    with st.spinner("Getting AI response..."):
-                        result = goals_manager.chat_with_ai(selected_goal_id, user_message)
-                        
+                    if CHAT_STREAMING:
+                        st.markdown("### AI Response:")
+                        placeholder = st.empty()
+                        placeholder.markdown("_Thinking..._")
+                        streamed = ""
+                        result = {"success": False, "error": "Failed to get AI response"}
+                        for event in goals_manager.stream_chat_with_ai(selected_goal_id, user_message):
+                            if event["type"] == "token":
+                                streamed += event["content"]
+                                placeholder.markdown(streamed + "▌")
+                            else:
+                                result = event
                         if result["success"]:
-                            response = result["data"]
-                            
-                            st.markdown("### AI Response:")
-                            st.write(response["response"])
-                            
-                            st.markdown("### Confidence Level:")
-                            st.progress(response["confidence"] / 100)
-                            
-                            st.markdown("### Suggestions:")
-                            for suggestion in response["suggestions"]:
-                                st.write(f"• {suggestion}")
+                            placeholder.markdown(result["data"]["response"])
                         else:
-                            st.error(result["error"])
+                            placeholder.empty()
+                    else:
+                        with st.spinner("Getting AI response..."):
+                            result = goals_manager.chat_with_ai(selected_goal_id, user_message)
+                        if result["success"]:
+                            st.markdown("### AI Response:")
+                            st.write(result["data"]["response"])
+                    
+                    if result["success"]:
+                        response = result["data"]
+                        SessionStateManager.add_chat_message("user", user_message)
+                        SessionStateManager.add_chat_message("assistant", response["response"])
+                        
+                        st.markdown("### Confidence Level:")
+                        st.progress(response["confidence"] / 100)
+                        
+                        st.markdown("### Suggestions:")
+                        for suggestion in response["suggestions"]:
+                            st.write(f"• {suggestion}")
+                    else:
+                        st.error(result["error"])
                 else:
                     st.error("Please enter a message")
         else:
@@ -424,11 +543,34 @@ def render_ai_chat():
     else:
         st.error("Unable to load goals. Please try again.")
 
+def _load_earlier_chat_messages():
+    st.session_state.chat_history_pages = st.session_state.get("chat_history_pages", 0) + 1
+
+def render_chat_history():
+    """Render earlier messages of this session, paging spilled ones back in on request"""
+    total = SessionStateManager.get_chat_message_count()
+    if not total:
+        return
+    with st.expander(f"Conversation history ({total} messages)"):
+        recent = SessionStateManager.get_chat_history()
+        pages = st.session_state.get("chat_history_pages", 0)
+        older = []
+        if pages:
+            older = SessionStateManager.get_older_chat_messages(recent[0]["seq"], pages * CHAT_HISTORY_PAGE_SIZE)
+        first_seq = (older or recent)[0]["seq"]
+        # Stop offering more once a page comes back empty (e.g. the store is unavailable)
+        if first_seq > 0 and (older or not pages):
+            st.button("Load earlier messages", on_click=_load_earlier_chat_messages)
+        for message in older + recent:
+            speaker = "You" if message["role"] == "user" else "Coach"
+            st.markdown(f"**{speaker}:** {message['content']}")
+
+@profiled
 def render_analytics():
     """Render analytics page"""
     st.header("📈 Learning Analytics")
     
-    analytics_result = goals_manager.get_analytics()
+    analytics_result = _load_analytics()
     
     if analytics_result["success"]:
         analytics = analytics_result["data"]
@@ -452,25 +594,19 @@ def render_analytics():
             st.info(insight)
         
         # Goals progress chart
-        goals_result = goals_manager.get_user_goals()
+        goals_result = goals_manager.get_goal_store()
         if goals_result["success"]:
-            goals = goals_result["data"]
+            store = goals_result["data"]
             
-            if goals:
-                goal_names = [goal["title"] for goal in goals]
-                progress_values = [(goal["current_day"] / goal["target_days"]) * 100 for goal in goals]
-                
-                fig = px.bar(
-                    x=goal_names,
-                    y=progress_values,
-                    title="Goal Progress",
-                    labels={"x": "Goals", "y": "Progress (%)"}
-                )
+            if store:
+                with span("goal progress chart", "plotly"):
+                    fig = goal_progress_chart(store)
                 
                 st.plotly_chart(fig, use_container_width=True)
     else:
         st.error("Unable to load analytics. Please try again.")
 
+@profiled
 def render_settings():
     """Render settings page"""
     st.header("⚙️ Settings")
@@ -486,25 +622,86 @@ def render_settings():
     st.subheader("Preferences")
     st.write("Settings and preferences will be available here.")
 
+@profiled
+def render_performance():
+    """Render backend performance page for admins"""
+    st.header("⏱️ Performance")
+    
+    st.subheader("Backend Calls")
+    rows = registry.snapshot()
+    if rows:
+        st.dataframe(rows, use_container_width=True)
+    else:
+        st.info("No backend calls recorded yet.")
+    
+    timings = registry.duration_snapshot()
+    if timings:
+        st.subheader("Chat Streaming")
+        st.dataframe(timings, use_container_width=True)
+    
+    st.subheader("Client Caches")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**Goals cache**")
+        st.json(goals_manager.goals_cache_stats())
+        st.write("**Progress history sync**")
+        st.json(goals_manager.progress_sync_stats())
+        st.write("**Local analytics**")
+        st.json(goals_manager.analytics_stats())
+        st.write("**Page data memo (this session)**")
+        st.json(page_memo_stats())
+    with col2:
+        st.write("**Daily plans**")
+        st.json(goals_manager.plan_cache_stats())
+        st.write("**Progress write-behind queue**")
+        st.json(goals_manager.progress_queue_stats() or {"enabled": False})
+        st.write("**Request coalescing**")
+        st.json(goals_manager.coalescing_stats())
+        st.write("**Circuit breaker**")
+        st.json(breaker.stats() if breaker else {"enabled": False})
+    
+    st.download_button(
+        "Download Prometheus metrics",
+        data=registry.to_prometheus(),
+        file_name="metrics.prom",
+        mime="text/plain"
+    )
+
+def is_profiling_enabled() -> bool:
+    """Profiling is on via RENDER_PROFILE or a ?profile=1 query param"""
+    query_value = st.experimental_get_query_params().get("profile", [""])[0]
+    return RENDER_PROFILE or query_value.lower() in ("1", "true")
+
 def main():
     """Main application function"""
+    notice = st.empty()
+    with render_trace(is_profiling_enabled(), RENDER_PROFILE_DIR, max_files=RENDER_PROFILE_MAX_FILES):
+        with render_deadline(RENDER_DEADLINE_SECONDS) as deadline:
+            render_page()
+    if deadline is not None and deadline.degraded:
+        notice.warning("The server is responding slowly, so some data could not be loaded. "
+                       "Showing what is available; refresh to try again.")
+
+def render_page():
+    """Render the header, sidebar and selected page"""
     render_header()
     
-    # Check authentication
+    # Check authentication (token expiry is checked locally)
     if not auth_manager.is_authenticated():
-        # Get user info if token exists
-        token = auth_manager.get_token()
-        if token:
-            user_result = auth_manager.get_current_user(token)
-            if user_result["success"]:
-                st.session_state.user = user_result["data"]
-            else:
-                auth_manager.logout()
-        
         # Show auth forms
         render_auth_forms()
         return
     
+    # Get user info once per token; cached until the token expires
+    if "user" not in st.session_state:
+        user_result = auth_manager.get_current_user(auth_manager.get_token())
+        if user_result["success"]:
+            st.session_state.user = user_result["data"]
+        elif user_result.get("auth_rejected"):
+            auth_manager.logout()
+        # Otherwise the backend is unreachable or slow: keep the session, greet
+        # generically and look the user up again on a later rerun
+    
     # User is authenticated, show main app
     page = render_sidebar()
     
@@ -524,6 +721,8 @@ def main():
         render_analytics()
     elif page == "Settings":
         render_settings()
+    elif page == "Performance":
+        render_performance()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,241 @@
+import asyncio
+import atexit
+import functools
+import threading
+import aiohttp
+from typing import List, Dict, Any, Optional, Coroutine
+from config import API_BASE_URL, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT_SECONDS, HTTP_ENDPOINT_TIMEOUTS
+from auth_manager import AuthManager, _user_cache
+from goals_manager import _goals_cache, _plan_cache, _invalidate_goals, _record_progress
+from metrics import registry, endpoint_label
+from circuit_breaker import breaker
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_client_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the process-wide event loop, started on a daemon thread on first use"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="async-client-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop and block until it finishes"""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result(timeout)
+
+
+async def get_client_session() -> aiohttp.ClientSession:
+    """Get the pooled aiohttp session; must be awaited on the shared loop"""
+    global _client_session
+    if _client_session is None or _client_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+            limit_per_host=HTTP_POOL_MAXSIZE
+        )
+        _client_session = aiohttp.ClientSession(connector=connector)
+    return _client_session
+
+
+async def _request(method: str, path: str, error: str, headers: Dict[str, str],
+                   api_base_url: str = API_BASE_URL, **kwargs) -> Dict[str, Any]:
+    """Send a request with the endpoint's default timeout and the circuit breaker, in the manager response shape"""
+    endpoint = endpoint_label(method, path)
+    kwargs.setdefault("timeout", aiohttp.ClientTimeout(
+        total=HTTP_ENDPOINT_TIMEOUTS.get(endpoint, HTTP_TIMEOUT_SECONDS)
+    ))
+    try:
+        if breaker is not None:
+            breaker.before_call(endpoint)
+        session = await get_client_session()
+        try:
+            async with session.request(method, f"{api_base_url}{path}", headers=headers, **kwargs) as response:
+                if breaker is not None:
+                    breaker.record(failed=response.status >= 500)
+                if response.status == 200:
+                    return {"success": True, "data": await response.json()}
+                else:
+                    return {"success": False, "error": error, "auth_rejected": response.status in (401, 403)}
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
+            if breaker is not None:
+                breaker.record(failed=True)
+            raise
+    except asyncio.TimeoutError:
+        registry.increment("backend_timeouts_total", {"endpoint": endpoint})
+        return {"success": False, "error": f"Request timeout - {endpoint} took too long"}
+    except Exception as e:
+        return {"success": False, "error": f"Connection error: {str(e)}"}
+
+
+@atexit.register
+def _close_client_session():
+    """Close pooled connections cleanly when the process exits"""
+    if _loop is not None and _client_session is not None and not _client_session.closed:
+        try:
+            run_sync(_client_session.close(), timeout=5)
+        except Exception:
+            pass
+
+
+class AsyncGoalsManager:
+    """Asyncio counterpart of GoalsManager"""
+
+    def __init__(self, token: Optional[str], api_base_url: str = API_BASE_URL):
+        self.token = token
+        self.api_base_url = api_base_url
+
+    def get_auth_headers(self) -> Dict[str, str]:
+        """Get authentication headers"""
+        if not self.token:
+            raise Exception("User not authenticated")
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def _request(self, method: str, path: str, error: str, **kwargs) -> Dict[str, Any]:
+        """Send an authenticated request and wrap the result in the manager response shape"""
+        try:
+            headers = self.get_auth_headers()
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+        return await _request(method, path, error, headers, self.api_base_url, **kwargs)
+
+    async def create_goal(self, title: str, description: str, category: str, target_days: int) -> Dict[str, Any]:
+        """Create a new learning goal"""
+        result = await self._request("POST", "/goals", "Failed to create goal", json={
+            "title": title,
+            "description": description,
+            "category": category,
+            "target_days": target_days
+        })
+        if result["success"]:
+            _invalidate_goals(self.token)
+        return result
+
+    async def get_user_goals(self) -> Dict[str, Any]:
+        """Get all goals for the current user"""
+        cached = _goals_cache.get(self.token)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        result = await self._request("GET", "/goals", "Failed to fetch goals")
+        if result["success"]:
+            _goals_cache.set(self.token, result["data"])
+        return result
+
+    async def get_daily_plan(self, goal_id: int, day: int) -> Dict[str, Any]:
+        """Get AI-generated daily plan"""
+        key = (self.token, goal_id, day)
+        cached = _plan_cache.get(key)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        result = await self._request("GET", f"/goals/{goal_id}/plan/{day}", "Failed to generate plan")
+        if result["success"]:
+            _plan_cache.set(key, result["data"])
+        return result
+
+    async def log_progress(self, goal_id: int, day: int, topics_covered: List[str],
+                           hours_studied: float, problems_solved: int,
+                           confidence_level: int, notes: str = "") -> Dict[str, Any]:
+        """Log daily progress"""
+        result = await self._request("POST", "/progress", "Failed to log progress", json={
+            "goal_id": goal_id,
+            "day": day,
+            "topics_covered": topics_covered,
+            "hours_studied": hours_studied,
+            "problems_solved": problems_solved,
+            "confidence_level": confidence_level,
+            "notes": notes
+        })
+        if result["success"]:
+            _invalidate_goals(self.token)
+            _record_progress(self.token, goal_id, result["data"])
+        return result
+
+    async def get_goal_progress(self, goal_id: int) -> Dict[str, Any]:
+        """Get progress history for a goal"""
+        return await self._request("GET", f"/goals/{goal_id}/progress", "Failed to fetch progress")
+
+    async def chat_with_ai(self, goal_id: int, message: str) -> Dict[str, Any]:
+        """Chat with AI learning coach"""
+        return await self._request("POST", "/chat", "Failed to get AI response", json={
+            "message": message,
+            "goal_id": goal_id
+        })
+
+    async def get_analytics(self) -> Dict[str, Any]:
+        """Get user analytics"""
+        return await self._request("GET", "/analytics", "Failed to fetch analytics")
+
+
+class AsyncAuthManager:
+    """Asyncio counterpart of AuthManager"""
+
+    def __init__(self, api_base_url: str = API_BASE_URL):
+        self.api_base_url = api_base_url
+
+    async def login_user(self, email: str, password: str) -> Dict[str, Any]:
+        """Login user and get access token"""
+        try:
+            session = await get_client_session()
+            async with session.post(
+                f"{self.api_base_url}/auth/login",
+                json={
+                    "email": email,
+                    "password": password
+                },
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                if response.status == 200:
+                    return {"success": True, "data": await response.json()}
+                error_detail = "Login failed"
+                try:
+                    error_data = await response.json(content_type=None)
+                    error_detail = error_data.get("detail", error_detail)
+                except Exception:
+                    error_detail = await response.text() or error_detail
+                return {"success": False, "error": error_detail}
+        except asyncio.TimeoutError:
+            return {"success": False, "error": "Request timeout - server not responding"}
+        except aiohttp.ClientConnectionError:
+            return {"success": False, "error": "Connection error - cannot reach server"}
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+
+    async def get_current_user(self, token: str) -> Dict[str, Any]:
+        """Get current user information, sharing the expiry check and cache of AuthManager"""
+        tokens = AuthManager()
+        if tokens.is_token_expired(token):
+            return {"success": False, "error": "Session expired", "auth_rejected": True}
+        cached = _user_cache.get(token)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        result = await _request("GET", "/auth/me", "Failed to get user info",
+                                {"Authorization": f"Bearer {token}"}, self.api_base_url)
+        if result["success"]:
+            _user_cache.set(token, result["data"], ttl=tokens.get_token_ttl(token))
+        return result
+
+
+class SyncShim:
+    """Blocking facade over an async manager, so script code can call it like the sync managers
+
+    Example: ``SyncShim(AsyncGoalsManager(st.session_state.get("token"))).get_user_goals()``
+    """
+
+    def __init__(self, manager: Any):
+        self._manager = manager
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._manager, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return run_sync(attr(*args, **kwargs))
+        return call
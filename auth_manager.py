@@ -1,16 +1,43 @@
 import streamlit as st
 import requests
+import base64
+import json
+import time
 from typing import Optional, Dict, Any
-from config import API_BASE_URL
+from config import API_BASE_URL, AUTH_ME_CACHE_TTL_SECONDS, AUTH_CLOCK_SKEW_SECONDS
+from http_transport import get_session, decode_body
+from cache import TTLCache
+from deadline import DeadlineExceeded
+from session_state import SessionStateManager
+from singleflight import coalescer
+
+# /auth/me results keyed by token, kept until the token expires
+_user_cache = TTLCache(ttl=AUTH_ME_CACHE_TTL_SECONDS)
+
+
+def decode_token_claims(token: str) -> Optional[Dict[str, Any]]:
+    """Decode the claims of a JWT without verifying its signature
+    
+    The signature can only be checked by the backend; the claims are only
+    used locally for expiry checks, never for authorization.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return claims if isinstance(claims, dict) else None
+    except Exception:
+        return None
 
 class AuthManager:
     def __init__(self):
         self.api_base_url = API_BASE_URL
+        self.session = get_session()
         
     def register_user(self, email: str, username: str, full_name: str, password: str) -> Dict[str, Any]:
         """Register a new user"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/auth/register",
                 json={
                     "email": email,
@@ -22,11 +49,11 @@ class AuthManager:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": decode_body(response)}
             else:
                 error_detail = "Registration failed"
                 try:
-                    error_data = response.json()
+                    error_data = decode_body(response)
                     error_detail = error_data.get("detail", error_detail)
                 except:
                     error_detail = response.text or error_detail
@@ -41,7 +68,7 @@ class AuthManager:
     def login_user(self, email: str, password: str) -> Dict[str, Any]:
         """Login user and get access token"""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/auth/login",
                 json={
                     "email": email,
@@ -51,12 +78,12 @@ class AuthManager:
             )
             
             if response.status_code == 200:
-                token_data = response.json()
+                token_data = decode_body(response)
                 return {"success": True, "data": token_data}
             else:
                 error_detail = "Login failed"
                 try:
-                    error_data = response.json()
+                    error_data = decode_body(response)
                     error_detail = error_data.get("detail", error_detail)
                 except:
                     error_detail = response.text or error_detail
@@ -69,21 +96,56 @@ class AuthManager:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
     def get_current_user(self, token: str) -> Dict[str, Any]:
-        """Get current user information"""
+        """Get current user information
+        
+        Failures caused by the token itself (expired locally, or rejected with
+        401/403) carry "auth_rejected": True; any other failure is transient.
+        """
+        if self.is_token_expired(token):
+            return {"success": False, "error": "Session expired", "auth_rejected": True}
+        cached = _user_cache.get(token)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        try:
+            return coalescer.do((token, "get_current_user"), lambda: self._fetch_current_user(token), "get_current_user")
+        except DeadlineExceeded as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+    
+    def _fetch_current_user(self, token: str) -> Dict[str, Any]:
+        """Fetch /auth/me and cache the user until the token expires"""
         try:
             headers = {"Authorization": f"Bearer {token}"}
-            response = requests.get(f"{self.api_base_url}/auth/me", headers=headers)
+            response = self.session.get(f"{self.api_base_url}/auth/me", headers=headers)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                user = decode_body(response)
+                _user_cache.set(token, user, ttl=self.get_token_ttl(token))
+                return {"success": True, "data": user}
             else:
-                return {"success": False, "error": "Failed to get user info"}
+                return {"success": False, "error": "Failed to get user info",
+                        "auth_rejected": response.status_code in (401, 403)}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    def get_token_ttl(self, token: str) -> float:
+        """Seconds until the token expires, or the default cache TTL if it has no exp claim"""
+        claims = decode_token_claims(token) or {}
+        if "exp" not in claims:
+            return AUTH_ME_CACHE_TTL_SECONDS
+        try:
+            return max(0.0, float(claims["exp"]) - time.time() - AUTH_CLOCK_SKEW_SECONDS)
+        except (TypeError, ValueError):
+            return AUTH_ME_CACHE_TTL_SECONDS
+    
+    def is_token_expired(self, token: str) -> bool:
+        """Check the token's exp claim locally; tokens without one are left to the backend"""
+        claims = decode_token_claims(token) or {}
+        return "exp" in claims and self.get_token_ttl(token) <= 0
+    
     def is_authenticated(self) -> bool:
         """Check if user is authenticated"""
-        return "token" in st.session_state and st.session_state.token is not None
+        token = st.session_state.get("token")
+        return token is not None and not self.is_token_expired(token)
     
     def get_token(self) -> Optional[str]:
         """Get current user token"""
@@ -92,7 +154,11 @@ class AuthManager:
     def logout(self):
         """Logout user"""
         if "token" in st.session_state:
+            _user_cache.invalidate(st.session_state.token)
             del st.session_state.token
         if "user" in st.session_state:
             del st.session_state.user
+        # The conversation belongs to this user; drop it, spilled messages included
+        SessionStateManager.clear_chat_history()
+        st.session_state.pop("chat_history_pages", None)
         st.rerun() 
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""Microbenchmarks for the client layer (GoalsManager / AuthManager) against the stub backend.
+
+    python benchmarks/bench_client.py --iterations 200
+    python benchmarks/bench_client.py --baseline benchmarks/results/client-<ts>.json
+
+Stub latency defaults to zero, so timings measure client overhead: connection
+handling, JSON decoding, caching and bookkeeping.
+"""
+import argparse
+import itertools
+import json
+import sys
+
+from benchlib import prepare_environment, login_token, measure, save_results, compare, print_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub latency per request in seconds")
+    parser.add_argument("--goals", type=int, default=20)
+    parser.add_argument("--progress-entries", type=int, default=365)
+    parser.add_argument("--plan-items", type=int, default=10)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/client-<timestamp>.json)")
+    parser.add_argument("--baseline", help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative p50 slowdown counted as a regression")
+    args = parser.parse_args()
+
+    url = prepare_environment(latency=args.latency, goals=args.goals,
+                              progress_entries=args.progress_entries, plan_items=args.plan_items)
+
+    # App modules read config at import time, so import after prepare_environment
+    import requests
+    import goals_manager as gm
+    from auth_manager import AuthManager, _user_cache
+    from http_transport import get_session
+
+    token = login_token(url)
+    goals = gm.GoalsManager()
+    auth = AuthManager()
+    n = args.iterations
+    results = {}
+
+    with gm.bound_token(token):
+        goal_id = goals.get_user_goals()["data"][0]["id"]
+        days = itertools.count(1)
+
+        # Transport: fresh connection per call vs the pooled keep-alive session
+        results["transport.unpooled_get"] = measure(lambda: requests.get(f"{url}/health", timeout=10), n)
+        results["transport.pooled_get"] = measure(lambda: get_session().get(f"{url}/health", timeout=10), n)
+
+        # JSON decode cost of the largest payloads (the session prefers MessagePack, so ask for JSON)
+        json_headers = dict(goals.get_auth_headers(), Accept="application/json")
+        progress_body = get_session().get(f"{url}/goals/{goal_id}/progress", headers=json_headers).content
+        goals_body = get_session().get(f"{url}/goals", headers=json_headers).content
+        results["json.decode_progress"] = dict(measure(lambda: json.loads(progress_body), n), bytes=len(progress_body))
+        results["json.decode_goals"] = dict(measure(lambda: json.loads(goals_body), n), bytes=len(goals_body))
+
+        # Cache effects: cold (cache cleared before each call) vs warm
+        results["goals.get_user_goals.cold"] = measure(goals.get_user_goals, n, setup=gm._goals_cache.clear)
+        results["goals.get_user_goals.warm"] = measure(goals.get_user_goals, n)
+
+        results["goals.get_daily_plan.backend"] = measure(lambda: goals.get_daily_plan(goal_id, next(days)), n)
+        results["goals.get_daily_plan.store"] = measure(lambda: goals.get_daily_plan(goal_id, 1), n,
+                                                        setup=gm._plan_cache.clear)
+        results["goals.get_daily_plan.memory"] = measure(lambda: goals.get_daily_plan(goal_id, 1), n)
+
+        history_key = (token, goal_id)
+        results["goals.get_goal_progress.full"] = measure(lambda: goals.get_goal_progress(goal_id), n,
+                                                          setup=lambda: gm._progress_history.invalidate(history_key))
+        results["goals.get_goal_progress.incremental"] = measure(lambda: goals.get_goal_progress(goal_id), n)
+
+        results["goals.get_analytics"] = measure(goals.get_analytics, n)
+        results["goals.fetch_concurrently"] = measure(lambda: goals.fetch_concurrently({
+            "analytics": goals.get_analytics,
+            "goals": goals.get_user_goals
+        }), n, setup=gm._goals_cache.clear)
+        results["goals.chat_with_ai"] = measure(lambda: goals.chat_with_ai(goal_id, "How should I start?"), n)
+        results["goals.log_progress"] = measure(lambda: goals.log_progress(
+            goal_id, 1, ["Topic 1"], 1.0, 1, 50, "benchmark"
+        ), n)
+
+    results["auth.login_user"] = measure(lambda: auth.login_user("demo@example.com", "demo"), n)
+    results["auth.get_current_user.cold"] = measure(lambda: auth.get_current_user(token), n,
+                                                    setup=_user_cache.clear)
+    results["auth.get_current_user.warm"] = measure(lambda: auth.get_current_user(token), n)
+
+    print_results(results)
+    options = vars(args).copy()
+    path = save_results("client", results, options, args.output)
+    print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
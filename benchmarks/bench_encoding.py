@@ -0,0 +1,90 @@
+"""Wire size and decode cost of response encodings for a large progress history.
+
+    python benchmarks/bench_encoding.py --progress-entries 2000 --iterations 50
+
+Fetches GET /goals/{id}/progress from the stub backend once per combination of
+body format (JSON, MessagePack) and Content-Encoding (identity, gzip, br) and
+reports bytes on the wire, decoded size, the time to undo the encoding and
+parse the body, and the end-to-end fetch time. Combinations whose optional
+package (msgpack, brotli) is not installed are skipped.
+"""
+import argparse
+import gzip
+import json
+import sys
+
+from benchlib import prepare_environment, login_token, measure, save_results, compare, print_results
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--progress-entries", type=int, default=2000)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/encoding-<timestamp>.json)")
+    parser.add_argument("--baseline", help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative p50 slowdown counted as a regression")
+    args = parser.parse_args()
+
+    url = prepare_environment(latency=0.0, goals=1, progress_entries=args.progress_entries)
+
+    from http_transport import get_session, decode_body
+
+    token = login_token(url)
+    session = get_session()
+    progress_url = f"{url}/goals/1/progress"
+
+    formats = {"json": ("application/json", json.loads)}
+    if msgpack is not None:
+        formats["msgpack"] = ("application/msgpack", lambda body: msgpack.unpackb(body, raw=False))
+    encodings = {"identity": lambda body: body, "gzip": gzip.decompress}
+    if brotli is not None:
+        encodings["br"] = brotli.decompress
+
+    results = {}
+    print(f"{'variant':<20} {'wire bytes':>12} {'decoded bytes':>14}")
+    for format_name, (accept, parse) in formats.items():
+        for encoding_name, decompress in encodings.items():
+            headers = {"Authorization": f"Bearer {token}", "Accept": accept, "Accept-Encoding": encoding_name}
+            name = f"{format_name}.{encoding_name}"
+
+            # Raw body as sent, so decoding can be timed on its own
+            response = session.get(progress_url, headers=headers, stream=True)
+            wire_body = response.raw.read(decode_content=False)
+            response.close()
+            decoded_size = len(decompress(wire_body))
+            entries = len(parse(decompress(wire_body)))
+            assert entries == args.progress_entries, f"{name}: got {entries} entries"
+
+            results[f"{name}.decode"] = dict(
+                measure(lambda: parse(decompress(wire_body)), args.iterations),
+                wire_bytes=len(wire_body), decoded_bytes=decoded_size
+            )
+            results[f"{name}.fetch"] = measure(
+                lambda: decode_body(session.get(progress_url, headers=headers)), args.iterations
+            )
+            print(f"{name:<20} {len(wire_body):>12} {decoded_size:>14}")
+
+    print()
+    print_results(results)
+    path = save_results("encoding", results, vars(args), args.output)
+    print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
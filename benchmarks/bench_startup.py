@@ -0,0 +1,91 @@
+"""Cold-start benchmark: import time and time to first paint of the login page.
+
+    python benchmarks/bench_startup.py --iterations 10
+    python benchmarks/bench_startup.py --baseline benchmarks/results/startup-<ts>.json
+
+Every iteration runs in a fresh interpreter so module imports are not cached.
+The "eager_plotly" variant imports plotly.express up front, as app.py used to,
+to show what the lazy chart imports save.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchlib import REPO_ROOT, prepare_environment, save_results, summarize, compare, print_results
+
+# Runs in the child interpreter; prints one JSON line of timings in seconds
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import streamlit
+streamlit_done = time.perf_counter()
+if {eager!r}:
+    import plotly.express
+import auth_manager, goals_manager, charts, metrics, profiler
+imports_done = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=60)
+paint_started = time.perf_counter()
+at.run()
+painted = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({{
+    "import_streamlit": streamlit_done - started,
+    "import_app_modules": imports_done - streamlit_done,
+    "first_paint": painted - paint_started,
+    "cold_start_total": painted - started,
+    "plotly_express_loaded": "plotly.express" in sys.modules
+}}))
+"""
+
+
+def run_child(eager: bool) -> Dict[str, float]:
+    code = CHILD.format(root=REPO_ROOT, eager=eager, app=os.path.join(REPO_ROOT, "app.py"))
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                            env=os.environ.copy()).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/startup-<timestamp>.json)")
+    parser.add_argument("--baseline", help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative p50 slowdown counted as a regression")
+    args = parser.parse_args()
+
+    # The login page makes no backend calls, but point the app at the stub anyway
+    prepare_environment()
+
+    results = {}
+    for variant, eager in (("lazy_plotly", False), ("eager_plotly", True)):
+        samples: Dict[str, List[float]] = {}
+        loaded = False
+        for _ in range(args.iterations):
+            timings = run_child(eager)
+            loaded = timings.pop("plotly_express_loaded")
+            for name, seconds in timings.items():
+                samples.setdefault(name, []).append(seconds)
+        for name, timings in samples.items():
+            results[f"{variant}.{name}"] = summarize(timings)
+        results[f"{variant}.plotly_express_loaded"] = {"value": loaded}
+
+    print_results(results)
+    for variant in ("lazy_plotly", "eager_plotly"):
+        print(f"{variant}: plotly.express loaded after login paint = {results[f'{variant}.plotly_express_loaded']['value']}")
+    path = save_results("startup", results, vars(args), args.output)
+    print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
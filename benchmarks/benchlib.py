@@ -0,0 +1,119 @@
+"""Shared helpers for the client-side benchmarks.
+
+Call prepare_environment() before importing any app module: config.py reads
+its settings from the environment at import time.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def prepare_environment(**stub_options) -> str:
+    """Start a stub backend and point the app config (and its on-disk stores) at throwaway locations"""
+    import stub_backend
+
+    server = stub_backend.start_in_thread(**stub_options)
+    url = f"http://127.0.0.1:{server.server_port}"
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    os.environ["BACKEND_URL"] = url
+    os.environ.setdefault("PLAN_STORE_PATH", os.path.join(scratch, "plans.sqlite3"))
+    os.environ.setdefault("PROGRESS_QUEUE_PATH", os.path.join(scratch, "progress_queue.sqlite3"))
+    os.environ.setdefault("CHAT_HISTORY_PATH", os.path.join(scratch, "chat_history.sqlite3"))
+    os.environ.setdefault("RENDER_PROFILE_DIR", os.path.join(scratch, "profiles"))
+    return url
+
+
+def login_token(url: str) -> str:
+    """Log the stub's demo user in and return its access token"""
+    import requests
+
+    response = requests.post(f"{url}/auth/login", json={"email": "demo@example.com", "password": "demo"}, timeout=10)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def measure(func: Callable[[], Any], iterations: int, warmup: int = 3,
+            setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """Time func over iterations, running setup (untimed) before each call"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    timings: List[float] = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return summarize(timings)
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Summary statistics in milliseconds"""
+    ordered = sorted(timings)
+    return {
+        "iterations": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000
+    }
+
+
+def save_results(suite: str, results: Dict[str, Dict[str, Any]], options: Dict[str, Any],
+                 output: Optional[str] = None) -> str:
+    """Write results as JSON (default: benchmarks/results/<suite>-<timestamp>.json)"""
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    document = {
+        "suite": suite,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": options,
+        "results": results
+    }
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    return output
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline_path: str, threshold: float,
+            metric: str = "p50_ms") -> List[str]:
+    """Print a comparison against a saved baseline and return the names that regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    print(f"\n{'benchmark':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, stats in results.items():
+        if name not in baseline or metric not in stats or metric not in baseline[name]:
+            continue
+        before, after = baseline[name][metric], stats[metric]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<44} {before:>10.3f} {after:>10.3f} {change:>+7.1%}{flag}")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, Any]]):
+    """Print a results table"""
+    print(f"{'benchmark':<44} {'p50 ms':>10} {'p95 ms':>10} {'mean ms':>10}")
+    for name, stats in results.items():
+        if "p50_ms" in stats:
+            print(f"{name:<44} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['mean_ms']:>10.3f}")
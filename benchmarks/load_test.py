@@ -0,0 +1,237 @@
+"""Concurrent multi-session load test of app.py against the stub backend.
+
+    python benchmarks/load_test.py --sessions 1,5,10,25 --latency 0.05
+
+Each simulated session is a Streamlit AppTest instance running the real
+app.py script. All sessions of a level step through the same flow together
+(login, dashboard, daily plan, progress log, chat), so the backend calls made
+during a step can be attributed to that step's reruns. Latency and calls are
+reported per script run actually made, including the runs repeated to work
+around AppTest races, which are also counted in the retries column.
+"""
+import argparse
+import os
+import resource
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from benchlib import REPO_ROOT, prepare_environment, save_results, summarize
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MiB"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS (KiB on Linux, bytes on macOS) where /proc is unavailable
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _button(at, label: str):
+    return next(button for button in at.button if button.label == label)
+
+
+def _rendered(at) -> bool:
+    """Whether the last run produced any main-area elements"""
+    try:
+        return len(at.main) > 0
+    except KeyError:
+        # Not run yet, or the run produced no main block at all
+        return False
+
+
+def _pin_goal_selection(at):
+    # AppTest cannot round-trip selectbox values shown through format_func,
+    # so before every rerun pin the goal selectboxes to their first option
+    if not _rendered(at):
+        return
+    for selectbox in at.main.selectbox:
+        selectbox.select_index(0)
+
+
+# Script runs started per AppTest session, retries included
+_run_counts: Dict[int, int] = {}
+
+
+def _count_run(at):
+    _run_counts[id(at)] = _run_counts.get(id(at), 0) + 1
+
+
+def _run(at, element=None):
+    """Rerun after interacting with element, tolerating AppTest 1.28 races on st.rerun()"""
+    _pin_goal_selection(at)
+    _count_run(at)
+    try:
+        (element or at).run()
+    except KeyError:
+        # The app called st.rerun() and the test runner lost the final
+        # client state; the session state is intact, so render again
+        _rerun(at)
+    # Under concurrency a run that stops for st.rerun() can come back with an
+    # empty element tree; widget state is already applied, so render again
+    for _ in range(3):
+        if _rendered(at):
+            break
+        _rerun(at)
+
+
+def _rerun(at):
+    _pin_goal_selection(at)
+    _count_run(at)
+    at.run()
+
+
+def _navigate(at, page: str):
+    # Retry when a concurrent rerun drops the sidebar or the page selection
+    for _ in range(3):
+        if not at.sidebar.selectbox:
+            _rerun(at)
+            continue
+        _run(at, at.sidebar.selectbox[0].select(page))
+        if at.sidebar.selectbox and at.sidebar.selectbox[0].value == page:
+            return
+    raise RuntimeError(f"Could not navigate to {page}")
+
+
+def step_login(at):
+    # A concurrent run can swallow the form submit; submit again until logged in
+    for _ in range(3):
+        if "token" in at.session_state:
+            return
+        if not at.text_input:
+            _rerun(at)
+            continue
+        at.text_input(key="login_email").input("demo@example.com")
+        at.text_input(key="login_password").input("demo")
+        _run(at, _button(at, "Login").click())
+    if "token" not in at.session_state:
+        raise RuntimeError("Login did not complete")
+
+
+def step_dashboard(at):
+    _navigate(at, "Dashboard")
+
+
+def step_daily_plan(at):
+    _navigate(at, "Daily Plans")
+    _run(at, _button(at, "Generate Plan").click())
+
+
+def step_progress_log(at):
+    _navigate(at, "Progress Tracking")
+    at.multiselect[0].select("Topic 1")
+    _run(at, _button(at, "Log Progress").click())
+
+
+def step_chat(at):
+    _navigate(at, "AI Chat")
+    at.text_input(key="chat_input").input("How should I review today?")
+    _run(at, _button(at, "Send Message").click())
+
+
+STEPS: Dict[str, Callable] = {
+    "login": step_login,
+    "dashboard": step_dashboard,
+    "daily_plan": step_daily_plan,
+    "progress_log": step_progress_log,
+    "chat": step_chat
+}
+
+# Reruns each step needs without retries (navigation plus action)
+RERUNS_PER_STEP = {"login": 1, "dashboard": 1, "daily_plan": 2, "progress_log": 2, "chat": 2}
+
+
+def share_test_runtime():
+    """Let many AppTest sessions run concurrently in one process
+
+    AppTest (Streamlit 1.28) installs a mock Runtime singleton at the start of
+    every run and clears it at the end, which breaks any other session still
+    running. Install one mock for the whole process and give AppTest a private
+    holder to write to instead.
+    """
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("AppTestRuntimeHolder", (), {"_instance": None})
+
+
+def run_level(sessions: int, timeout: float) -> Dict[str, Dict[str, float]]:
+    """Drive `sessions` concurrent sessions through every step and summarize each step"""
+    from streamlit.testing.v1 import AppTest
+    from metrics import registry
+
+    def backend_calls() -> int:
+        return sum(row["calls"] for row in registry.snapshot())
+
+    apps = [AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=timeout) for _ in range(sessions)]
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(_run, apps))
+
+        results = {}
+        for name, step in STEPS.items():
+            def timed(at) -> Tuple[float, int]:
+                runs_before = _run_counts.get(id(at), 0)
+                started = time.perf_counter()
+                step(at)
+                if at.exception:
+                    raise RuntimeError(f"{name} failed: {at.exception[0].message}")
+                return time.perf_counter() - started, _run_counts[id(at)] - runs_before
+
+            calls_before = backend_calls()
+            outcomes: List[Tuple[float, int]] = list(pool.map(timed, apps))
+            # Divide by the runs each session actually made, so retries show up as slower reruns
+            per_rerun = sorted(elapsed / max(runs, 1) for elapsed, runs in outcomes)
+            reruns = sum(runs for _, runs in outcomes)
+            stats = summarize(per_rerun)
+            stats["p99_ms"] = per_rerun[min(len(per_rerun) - 1, int(len(per_rerun) * 0.99))] * 1000
+            stats["backend_calls_per_rerun"] = (backend_calls() - calls_before) / reruns
+            stats["reruns"] = reruns
+            stats["retries"] = max(0, reruns - sessions * RERUNS_PER_STEP[name])
+            stats["rss_mb"] = rss_mb()
+            results[name] = stats
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10", help="comma-separated concurrency levels")
+    parser.add_argument("--latency", type=float, default=0.02, help="stub latency per request in seconds")
+    parser.add_argument("--plan-latency", type=float, default=0.2, help="stub latency of plan generation")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-rerun timeout in seconds")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    prepare_environment(latency=args.latency, endpoint_latency={"plan": args.plan_latency}, token_delay=0.0)
+    share_test_runtime()
+
+    levels = [int(level) for level in args.sessions.split(",")]
+    results = {}
+    print(f"{'sessions':>8} {'step':<14} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls/rerun':>12} "
+          f"{'retries':>8} {'rss MiB':>9}")
+    for sessions in levels:
+        level_results = run_level(sessions, args.timeout)
+        for step, stats in level_results.items():
+            results[f"{sessions}.{step}"] = stats
+            print(f"{sessions:>8} {step:<14} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} "
+                  f"{stats['p99_ms']:>9.1f} {stats['backend_calls_per_rerun']:>12.2f} "
+                  f"{stats['retries']:>8} {stats['rss_mb']:>9.1f}")
+
+    path = save_results("load", results, vars(args), args.output)
+    print(f"\nSaved results to {path}")
+
+
+if __name__ == "__main__":
+    main()
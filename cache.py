@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a live entry, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > time.monotonic():
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check for a live entry without touching hit/miss counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value for the configured TTL, or for ttl seconds when given"""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Drop the entry closest to expiry to stay bounded
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def invalidate(self, key: Hashable):
+        """Remove a single entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_matching(self, predicate: Callable[[Hashable], bool]):
+        """Remove every entry whose key satisfies the predicate"""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries)
+            }
@@ -0,0 +1,42 @@
+from typing import Any, Dict, List
+
+from goal_store import GoalStore
+
+
+# Plotly (plotly.express in particular) is imported inside the builders so
+# pages that draw no charts, like login and chat, never pay for the import
+
+
+def progress_chart(progress_logs: List[Dict[str, Any]]):
+    """Study hours and confidence per day, on two y axes"""
+    import plotly.graph_objects as go
+
+    days = [log["day"] for log in progress_logs]
+    hours = [log["hours_studied"] for log in progress_logs]
+    confidence = [log["confidence_level"] for log in progress_logs]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=days, y=hours, name="Study Hours", mode="lines+markers"))
+    fig.add_trace(go.Scatter(x=days, y=confidence, name="Confidence Level", mode="lines+markers", yaxis="y2"))
+    fig.update_layout(
+        title="Progress Over Time",
+        xaxis_title="Day",
+        yaxis_title="Study Hours",
+        yaxis2=dict(title="Confidence Level", overlaying="y", side="right"),
+        height=400
+    )
+    return fig
+
+
+def goal_progress_chart(store: GoalStore):
+    """Bar chart of completion percentage per goal"""
+    import plotly.express as px
+
+    goal_names = [goal["title"] for goal in store]
+    progress_values = [store.progress_ratio(goal_id) * 100 for goal_id in store.ids]
+    return px.bar(
+        x=goal_names,
+        y=progress_values,
+        title="Goal Progress",
+        labels={"x": "Goals", "y": "Progress (%)"}
+    )
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class ChatSpillStore:
+    """SQLite segments of chat messages that fell out of a session's in-memory window
+
+    Messages older than max_age are purged on startup and every purge_every
+    appends, so segments of sessions that ended without logging out do not
+    pile up in a long-running process.
+    """
+
+    def __init__(self, path: str, max_age: float, purge_every: int = 500):
+        self.path = path
+        self.max_age = max_age
+        self.purge_every = purge_every
+        self._appends = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS chat_messages_created ON chat_messages (created_at)")
+        self._conn.commit()
+        self.purge_expired()
+
+    def append(self, session_id: str, seq: int, role: str, content: str):
+        """Spill one message to the session's segment"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO chat_messages (session_id, seq, role, content, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (session_id, seq, role, content, time.time())
+            )
+            self._conn.commit()
+            self._appends += 1
+            due = self._appends % self.purge_every == 0
+        if due:
+            self.purge_expired()
+
+    def page(self, session_id: str, before_seq: int, limit: int) -> List[Tuple[int, str, str]]:
+        """Get up to limit (seq, role, content) messages preceding before_seq, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, role, content FROM chat_messages WHERE session_id = ? AND seq < ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, before_seq, limit)
+            ).fetchall()
+        return rows[::-1]
+
+    def clear(self, session_id: str):
+        """Delete a session's segment"""
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        """Delete segments of sessions that have been gone longer than max_age"""
+        with self._lock:
+            self._conn.execute("DELETE FROM chat_messages WHERE created_at < ?", (time.time() - self.max_age,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get spilled session and message counts"""
+        with self._lock:
+            sessions, messages = self._conn.execute(
+                "SELECT COUNT(DISTINCT session_id), COUNT(*) FROM chat_messages"
+            ).fetchone()
+        return {"sessions": sessions, "messages": messages}
+
+
+class ChatHistory:
+    """Chat history of one session: a bounded in-memory window backed by a spill store"""
+
+    def __init__(self, window: int, store: Optional[ChatSpillStore] = None):
+        self.session_id = uuid.uuid4().hex
+        self.window = window
+        self.store = store
+        # Compact (seq, role, content) records; roles are interned
+        self._recent: Deque[Tuple[int, str, str]] = deque()
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        """Total messages, including spilled ones"""
+        return self._next_seq
+
+    def append(self, role: str, content: str):
+        """Add a message, spilling the oldest in-memory message past the window"""
+        self._recent.append((self._next_seq, sys.intern(role), content))
+        self._next_seq += 1
+        while len(self._recent) > self.window:
+            seq, old_role, old_content = self._recent.popleft()
+            if self.store is not None:
+                try:
+                    self.store.append(self.session_id, seq, old_role, old_content)
+                except sqlite3.Error as e:
+                    print(f"Failed to spill chat message: {e}")
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Messages in the in-memory window, oldest first"""
+        return [_as_message(record) for record in self._recent]
+
+    def older(self, before_seq: int, limit: int) -> List[Dict[str, Any]]:
+        """Page spilled messages preceding before_seq back in from disk, oldest first"""
+        if self.store is None:
+            return []
+        try:
+            return [_as_message(record) for record in self.store.page(self.session_id, before_seq, limit)]
+        except sqlite3.Error as e:
+            print(f"Failed to load chat history: {e}")
+            return []
+
+    def clear(self):
+        """Drop all messages, in memory and on disk"""
+        self._recent.clear()
+        self._next_seq = 0
+        if self.store is not None:
+            try:
+                self.store.clear(self.session_id)
+            except sqlite3.Error as e:
+                print(f"Failed to clear chat history: {e}")
+
+
+def _as_message(record: Tuple[int, str, str]) -> Dict[str, Any]:
+    seq, role, content = record
+    return {"seq": seq, "role": role, "content": content}
@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import requests
+
+from config import (
+    CIRCUIT_BREAKER_ENABLED, CIRCUIT_BREAKER_WINDOW, CIRCUIT_BREAKER_MIN_CALLS,
+    CIRCUIT_BREAKER_ERROR_RATE, CIRCUIT_BREAKER_SLOW_CALL_RATE,
+    CIRCUIT_BREAKER_PROBE_INTERVAL, CIRCUIT_BREAKER_HALF_OPEN_CALLS
+)
+from metrics import registry
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge values of circuit_breaker_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """The backend is considered down; the request was not sent"""
+
+
+def _probe_health() -> bool:
+    # Imported here: api_client uses the transport that consults this breaker
+    from api_client import APIClient
+    return APIClient().get_health() is not None
+
+
+class CircuitBreaker:
+    """Process-wide breaker over backend calls, reopened for traffic by a background health probe
+
+    Closed: calls flow and their outcomes fill a rolling window. The breaker
+    opens when enough recent calls failed or ran close to their timeout.
+    Open: calls are rejected at once while a daemon thread polls the health
+    endpoint. Half-open: after a healthy probe a few trial calls go through;
+    they close the breaker if they all succeed, and reopen it otherwise.
+    """
+
+    def __init__(self, window: int = CIRCUIT_BREAKER_WINDOW,
+                 min_calls: int = CIRCUIT_BREAKER_MIN_CALLS,
+                 error_rate: float = CIRCUIT_BREAKER_ERROR_RATE,
+                 slow_call_rate: float = CIRCUIT_BREAKER_SLOW_CALL_RATE,
+                 probe_interval: float = CIRCUIT_BREAKER_PROBE_INTERVAL,
+                 half_open_calls: int = CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+                 probe: Callable[[], bool] = _probe_health):
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_rate = slow_call_rate
+        self.probe_interval = probe_interval
+        self.half_open_calls = half_open_calls
+        self.probe = probe
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.rejected = 0
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._trial_calls = 0
+        self._trial_successes = 0
+        self._lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+        registry.set_gauge("circuit_breaker_state", STATE_VALUES[CLOSED])
+
+    def before_call(self, endpoint: str):
+        """Raise CircuitOpenError unless a call may be sent now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and self._trial_calls < self.half_open_calls:
+                self._trial_calls += 1
+                return
+            self.rejected += 1
+        registry.increment("circuit_breaker_rejected_total", {"endpoint": endpoint})
+        raise CircuitOpenError(f"Backend unavailable, not calling {endpoint} (circuit open)")
+
+    def record(self, failed: bool, slow: bool = False):
+        """Record the outcome of a call that was let through"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._transition(OPEN)
+                else:
+                    self._trial_successes += 1
+                    if self._trial_successes >= self.half_open_calls:
+                        self._transition(CLOSED)
+                return
+            if self.state == OPEN:
+                return
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for failed_call, _ in self._outcomes if failed_call)
+            slow_calls = sum(1 for _, slow_call in self._outcomes if slow_call)
+            if failures / calls >= self.error_rate or slow_calls / calls >= self.slow_call_rate:
+                self._transition(OPEN)
+
+    def release(self):
+        """A let-through call ended without telling anything about the backend; free its trial slot"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trial_calls > 0:
+                self._trial_calls -= 1
+
+    def _transition(self, state: str):
+        """Switch state; the caller holds the lock"""
+        self.state = state
+        self._outcomes.clear()
+        self._trial_calls = 0
+        self._trial_successes = 0
+        registry.set_gauge("circuit_breaker_state", STATE_VALUES[state])
+        registry.increment("circuit_breaker_transitions_total", {"state": state})
+        if state == OPEN:
+            self.opened_at = time.time()
+            if self._prober is None or not self._prober.is_alive():
+                self._prober = threading.Thread(target=self._probe_loop, name="circuit-breaker-probe", daemon=True)
+                self._prober.start()
+        elif state == CLOSED:
+            self.opened_at = None
+
+    def _probe_loop(self):
+        """Poll the health endpoint while open; half-open once it answers
+
+        Runs until the breaker closes, so a failed trial call that reopens it
+        is probed again by the same thread.
+        """
+        while True:
+            time.sleep(self.probe_interval)
+            with self._lock:
+                if self.state == CLOSED:
+                    self._prober = None
+                    return
+                if self.state == HALF_OPEN:
+                    continue
+            try:
+                healthy = self.probe()
+            except Exception:
+                healthy = False
+            registry.increment("circuit_breaker_probes_total", {"outcome": "healthy" if healthy else "unhealthy"})
+            if healthy:
+                with self._lock:
+                    if self.state == OPEN:
+                        self._transition(HALF_OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the state, how long it has been open and how many calls were rejected"""
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self.state,
+                "open_for_seconds": time.time() - self.opened_at if self.opened_at else 0.0,
+                "rejected": self.rejected,
+                "window_calls": calls,
+                "window_error_rate": sum(1 for failed, _ in self._outcomes if failed) / calls if calls else 0.0
+            }
+
+
+# Process-wide breaker shared by all managers, or None when disabled
+breaker: Optional[CircuitBreaker] = CircuitBreaker() if CIRCUIT_BREAKER_ENABLED else None
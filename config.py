@@ -127,3 +127,105 @@ COLORS = {
     "danger": "#dc3545",
     "info": "#17a2b8"
 }
+
+# HTTP Transport Configuration
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # number of per-host pools kept
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))  # keep-alive connections per host
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "0"))
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"  # gzip, plus br when brotli is installed
+RESPONSE_MSGPACK = os.getenv("RESPONSE_MSGPACK", "true").lower() == "true"  # used when msgpack is installed
+
+# Timeout Configuration
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))  # endpoints without their own default
+HTTP_ENDPOINT_TIMEOUTS = {
+    "POST /auth/login": 5.0,
+    "GET /auth/me": 5.0,
+    "GET /goals/{id}/plan/{id}": 30.0,  # AI plan generation
+    "POST /chat": 30.0,
+    "POST /progress": 30.0  # AI feedback on the logged progress
+}
+# Overrides as "METHOD /path=seconds,...", e.g. "GET /analytics=3"
+HTTP_ENDPOINT_TIMEOUTS.update({
+    label.strip(): float(seconds)
+    for label, seconds in (
+        item.rsplit("=", 1) for item in os.getenv("HTTP_ENDPOINT_TIMEOUTS", "").split(",") if "=" in item
+    )
+})
+RENDER_DEADLINE_SECONDS = float(os.getenv("RENDER_DEADLINE_SECONDS", "30"))  # budget for all backend calls of one rerun; 0 disables
+
+# Client-side Cache Configuration
+GOALS_CACHE_TTL_SECONDS = float(os.getenv("GOALS_CACHE_TTL_SECONDS", "60"))
+GOALS_PAGE_SIZE = int(os.getenv("GOALS_PAGE_SIZE", "10"))  # goals per page on My Goals
+
+# Page Data Memoization Configuration
+PAGE_MEMO_ENABLED = os.getenv("PAGE_MEMO_ENABLED", "true").lower() == "true"
+PAGE_MEMO_TTL_SECONDS = float(os.getenv("PAGE_MEMO_TTL_SECONDS", "60"))  # picks up changes made outside this process
+
+# Concurrent Fetch Configuration
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+
+# Post-login Warm-up Configuration
+LOGIN_WARMUP_ENABLED = os.getenv("LOGIN_WARMUP_ENABLED", "true").lower() == "true"
+
+# AI Chat Configuration
+CHAT_STREAMING = os.getenv("CHAT_STREAMING", "true").lower() == "true"
+
+# Daily Plan Cache & Prefetch Configuration
+PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+PLAN_PREFETCH_DAYS = int(os.getenv("PLAN_PREFETCH_DAYS", "2"))  # days ahead to generate in the background
+PLAN_PREFETCH_MAX_WORKERS = int(os.getenv("PLAN_PREFETCH_MAX_WORKERS", "2"))
+PLAN_PREFETCH_MAX_INFLIGHT = int(os.getenv("PLAN_PREFETCH_MAX_INFLIGHT", "8"))
+
+# Persistent Plan Store Configuration
+PLAN_STORE_ENABLED = os.getenv("PLAN_STORE_ENABLED", "true").lower() == "true"
+PLAN_STORE_PATH = os.getenv("PLAN_STORE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "plans.sqlite3"))
+PLAN_STORE_MAX_BYTES = int(os.getenv("PLAN_STORE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# Progress Write-behind Queue Configuration
+PROGRESS_QUEUE_ENABLED = os.getenv("PROGRESS_QUEUE_ENABLED", "true").lower() == "true"
+PROGRESS_QUEUE_PATH = os.getenv("PROGRESS_QUEUE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "progress_queue.sqlite3"))
+PROGRESS_QUEUE_BATCH_SIZE = int(os.getenv("PROGRESS_QUEUE_BATCH_SIZE", "20"))
+PROGRESS_QUEUE_MAX_ATTEMPTS = int(os.getenv("PROGRESS_QUEUE_MAX_ATTEMPTS", "8"))
+PROGRESS_QUEUE_FLUSH_INTERVAL = float(os.getenv("PROGRESS_QUEUE_FLUSH_INTERVAL", "2"))
+PROGRESS_QUEUE_MAX_CONCURRENCY = int(os.getenv("PROGRESS_QUEUE_MAX_CONCURRENCY", "8"))  # submissions sent in parallel
+PROGRESS_QUEUE_ACK_WAIT = float(os.getenv("PROGRESS_QUEUE_ACK_WAIT", "3"))  # seconds the UI waits for AI feedback
+
+# Auth Configuration
+AUTH_ME_CACHE_TTL_SECONDS = float(os.getenv("AUTH_ME_CACHE_TTL_SECONDS", "900"))  # used when the token has no exp claim
+AUTH_CLOCK_SKEW_SECONDS = float(os.getenv("AUTH_CLOCK_SKEW_SECONDS", "30"))
+
+# Progress History Sync Configuration
+PROGRESS_FULL_REFRESH_SECONDS = float(os.getenv("PROGRESS_FULL_REFRESH_SECONDS", "600"))
+PROGRESS_HISTORY_MAX_GOALS = int(os.getenv("PROGRESS_HISTORY_MAX_GOALS", "256"))
+
+# Client-side Analytics Configuration
+ANALYTICS_LOCAL_ENABLED = os.getenv("ANALYTICS_LOCAL_ENABLED", "true").lower() == "true"  # hours/confidence from fetched logs
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "60"))
+
+# Metrics Configuration
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # serve /metrics on this port when set
+METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH", "")  # periodically write Prometheus text here when set
+METRICS_EXPORT_INTERVAL = float(os.getenv("METRICS_EXPORT_INTERVAL", "15"))
+PERFORMANCE_PAGE_ENABLED = os.getenv("PERFORMANCE_PAGE_ENABLED", "false").lower() == "true"
+
+# Render Profiling Configuration
+RENDER_PROFILE = os.getenv("RENDER_PROFILE", "false").lower() == "true"  # or add ?profile=1 to the URL
+RENDER_PROFILE_DIR = os.getenv("RENDER_PROFILE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "profiles"))
+RENDER_PROFILE_MAX_FILES = int(os.getenv("RENDER_PROFILE_MAX_FILES", "200"))
+
+# Chat History Configuration
+CHAT_HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", "50"))  # messages kept in memory per session
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "20"))
+CHAT_HISTORY_PATH = os.getenv("CHAT_HISTORY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "chat_history.sqlite3"))
+CHAT_HISTORY_MAX_AGE_SECONDS = float(os.getenv("CHAT_HISTORY_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
+# Circuit Breaker Configuration
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_BREAKER_WINDOW = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20"))  # recent calls considered
+CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+CIRCUIT_BREAKER_ERROR_RATE = float(os.getenv("CIRCUIT_BREAKER_ERROR_RATE", "0.5"))
+CIRCUIT_BREAKER_SLOW_CALL_RATE = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.5"))
+CIRCUIT_BREAKER_SLOW_CALL_RATIO = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATIO", "0.8"))  # of the call's timeout
+CIRCUIT_BREAKER_PROBE_INTERVAL = float(os.getenv("CIRCUIT_BREAKER_PROBE_INTERVAL", "5"))
+CIRCUIT_BREAKER_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "3"))  # trial calls before closing
@@ -0,0 +1,56 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import requests
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The render's time budget ran out before a backend call could start"""
+
+
+class Deadline:
+    """Time budget shared by every backend call made during one rerun"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._lock = threading.Lock()
+        self.timed_out: List[str] = []
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def record_timeout(self, endpoint: str):
+        with self._lock:
+            self.timed_out.append(endpoint)
+
+    @property
+    def degraded(self) -> bool:
+        """Whether any call of this render timed out or was skipped"""
+        with self._lock:
+            return bool(self.timed_out)
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar("render_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Get the deadline of the active render, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def render_deadline(seconds: float) -> Iterator[Optional[Deadline]]:
+    """Give backend calls made inside the block (and in fetch_concurrently workers) a shared budget"""
+    if seconds <= 0:
+        yield None
+        return
+    deadline = Deadline(seconds)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
@@ -0,0 +1,50 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class GoalStore:
+    """A user's goals normalized into id, category and status indexes, built once per goals list"""
+
+    def __init__(self, goals: List[Dict[str, Any]]):
+        # The list this store was built from; a new list object means the goals changed
+        self.source = goals
+        self.ids: List[int] = []
+        self.by_id: Dict[int, Dict[str, Any]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        self.by_status: Dict[str, List[int]] = {}
+        self._progress: Dict[int, float] = {}
+
+        for goal in goals:
+            goal_id = goal["id"]
+            self.ids.append(goal_id)
+            self.by_id[goal_id] = goal
+            self.by_category.setdefault(goal.get("category", ""), []).append(goal_id)
+            self.by_status.setdefault(goal.get("status", ""), []).append(goal_id)
+            target_days = goal.get("target_days") or 0
+            self._progress[goal_id] = goal.get("current_day", 0) / target_days if target_days else 0.0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.by_id[goal_id] for goal_id in self.ids)
+
+    def get(self, goal_id: int) -> Optional[Dict[str, Any]]:
+        """Get a goal by id"""
+        return self.by_id.get(goal_id)
+
+    def title(self, goal_id: int) -> str:
+        """Get a goal's title; usable directly as a selectbox format_func"""
+        goal = self.by_id.get(goal_id)
+        return goal["title"] if goal else str(goal_id)
+
+    def in_category(self, category: str) -> List[Dict[str, Any]]:
+        """Goals of one category, in list order"""
+        return [self.by_id[goal_id] for goal_id in self.by_category.get(category, [])]
+
+    def with_status(self, status: str) -> List[Dict[str, Any]]:
+        """Goals with one status, in list order"""
+        return [self.by_id[goal_id] for goal_id in self.by_status.get(status, [])]
+
+    def progress_ratio(self, goal_id: int) -> float:
+        """current_day / target_days of a goal"""
+        return self._progress.get(goal_id, 0.0)
@@ -1,24 +1,245 @@
 import streamlit as st
+import contextvars
 import requests
-from typing import List, Dict, Any, Optional
-from config import API_BASE_URL
+import functools
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future, CancelledError, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional, Callable, Iterator
+from config import (
+    API_BASE_URL, GOALS_CACHE_TTL_SECONDS, FETCH_MAX_WORKERS, PLAN_CACHE_TTL_SECONDS,
+    PLAN_PREFETCH_DAYS, PLAN_PREFETCH_MAX_WORKERS, PLAN_PREFETCH_MAX_INFLIGHT,
+    PLAN_STORE_ENABLED, PLAN_STORE_PATH, PLAN_STORE_MAX_BYTES, PROGRESS_QUEUE_ENABLED,
+    PROGRESS_QUEUE_PATH, PROGRESS_QUEUE_BATCH_SIZE, PROGRESS_QUEUE_MAX_ATTEMPTS,
+    PROGRESS_QUEUE_FLUSH_INTERVAL, PROGRESS_QUEUE_MAX_CONCURRENCY, PROGRESS_QUEUE_ACK_WAIT,
+    PROGRESS_FULL_REFRESH_SECONDS, PROGRESS_HISTORY_MAX_GOALS, GOALS_PAGE_SIZE, ANALYTICS_LOCAL_ENABLED,
+    ANALYTICS_CACHE_TTL_SECONDS
+)
+from http_transport import get_session, decode_body, wire_bytes
+from analytics_engine import AnalyticsEngine
+from auth_manager import AuthManager
+from cache import TTLCache
+from deadline import DeadlineExceeded, current_deadline
+from goal_store import GoalStore
+from page_memo import data_versions, invalidate_page_data
+from plan_store import PlanStore
+from progress_queue import ProgressQueue
+from progress_sync import ProgressHistoryStore
+from metrics import registry
+from singleflight import coalescer
+
+# Per-user goals lists, shared by every session in the process
+_goals_cache = TTLCache(ttl=GOALS_CACHE_TTL_SECONDS)
+
+# Pages of goals keyed by (token, limit, offset, search, category)
+_goals_page_cache = TTLCache(ttl=GOALS_CACHE_TTL_SECONDS)
+
+# GoalStore indexes over each user's cached goals list, rebuilt when the list changes
+_goal_stores = TTLCache(ttl=GOALS_CACHE_TTL_SECONDS)
+
+# (data version, /analytics response) per token
+_analytics_cache = TTLCache(ttl=ANALYTICS_CACHE_TTL_SECONDS)
+
+
+def _invalidate_goals(token: str):
+    """Drop the user's cached goals list, goal pages, analytics and memoized page data after a write"""
+    _goals_cache.invalidate(token)
+    _goal_stores.invalidate(token)
+    _goals_page_cache.invalidate_matching(lambda key: key[0] == token)
+    _analytics_cache.invalidate(token)
+    invalidate_page_data(token)
+
+
+def _goal_store(token: str, goals: List[Dict[str, Any]]) -> GoalStore:
+    """Get the user's GoalStore, building it only when the goals list is a different one"""
+    store = _goal_stores.get(token)
+    if store is None or store.source is not goals:
+        store = GoalStore(goals)
+        _goal_stores.set(token, store)
+    return store
+
+
+def _page_of_goals(store: GoalStore, limit: int, offset: int,
+                   search: str, category: str) -> Dict[str, Any]:
+    """Filter and slice a full goals list the way the backend's paginated /goals does"""
+    search = search.lower()
+    candidates = store.in_category(category) if category else list(store)
+    matching = [
+        goal for goal in candidates
+        if not search or search in goal.get("title", "").lower() or search in goal.get("description", "").lower()
+    ]
+    return {"items": matching[offset:offset + limit], "total": len(matching)}
+
+# Bounded pool for fanning out independent backend calls
+_fetch_pool = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix="goals-fetch")
+
+# Token bound to worker threads, which have no Streamlit session state
+_call_context = threading.local()
+
+# Generated daily plans keyed by (token, goal_id, day)
+_plan_cache = TTLCache(ttl=PLAN_CACHE_TTL_SECONDS)
+
+# Plan prefetches get their own small pool so they never delay page fetches
+_prefetch_pool = ThreadPoolExecutor(max_workers=PLAN_PREFETCH_MAX_WORKERS, thread_name_prefix="plan-prefetch")
+_inflight_plans: Dict[tuple, Future] = {}
+_inflight_lock = threading.RLock()
+
+# Plans persisted across restarts, keyed by goal version so edits regenerate them
+_plan_store: Optional[PlanStore] = None
+if PLAN_STORE_ENABLED:
+    try:
+        _plan_store = PlanStore(PLAN_STORE_PATH, PLAN_STORE_MAX_BYTES)
+        _plan_store.warm_start()
+    except Exception as e:
+        print(f"Plan store unavailable: {e}")
+
+
+
+# Local per-goal progress logs keyed by (token, goal_id), topped up incrementally
+_progress_history = ProgressHistoryStore(PROGRESS_FULL_REFRESH_SECONDS, PROGRESS_HISTORY_MAX_GOALS)
+
+# Study hours and confidence over those logs, keyed the same way
+_analytics = AnalyticsEngine(PROGRESS_HISTORY_MAX_GOALS)
+
+
+def _record_progress(token: str, goal_id: int, entry: Dict[str, Any]):
+    """Fold a delivered progress entry into the local analytics of the goal it was logged for"""
+    _analytics.record((token, goal_id), entry)
+
+def _send_progress(token: str, payload: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+    """Deliver one queued progress submission; retrying is safe thanks to the idempotency key"""
+    try:
+        response = get_session().post(
+            f"{API_BASE_URL}/progress",
+            headers={"Authorization": f"Bearer {token}", "Idempotency-Key": idempotency_key},
+            json=payload
+        )
+        if response.status_code == 200:
+            _invalidate_goals(token)
+            data = decode_body(response)
+            _record_progress(token, payload["goal_id"], data)
+            return {"success": True, "data": data}
+        retryable = response.status_code >= 500 or response.status_code in (408, 429)
+        return {"success": False, "error": "Failed to log progress", "retryable": retryable}
+    except requests.exceptions.ConnectionError as e:
+        # Includes an open circuit breaker: the backend never saw the request
+        return {"success": False, "error": f"Connection error: {str(e)}", "retryable": True, "unreachable": True}
+    except Exception as e:
+        return {"success": False, "error": f"Connection error: {str(e)}", "retryable": True}
+
+
+# Progress submissions persisted locally and flushed by a background worker
+_progress_queue: Optional[ProgressQueue] = None
+if PROGRESS_QUEUE_ENABLED:
+    try:
+        _progress_queue = ProgressQueue(
+            PROGRESS_QUEUE_PATH, _send_progress,
+            batch_size=PROGRESS_QUEUE_BATCH_SIZE,
+            max_attempts=PROGRESS_QUEUE_MAX_ATTEMPTS,
+            flush_interval=PROGRESS_QUEUE_FLUSH_INTERVAL,
+            max_concurrency=PROGRESS_QUEUE_MAX_CONCURRENCY
+        )
+        # Resume flushing anything left behind by a previous process
+        if _progress_queue.pending_count():
+            _progress_queue.start()
+    except Exception as e:
+        print(f"Progress queue unavailable: {e}")
+
+
+@contextmanager
+def bound_token(token: Optional[str]) -> Iterator[None]:
+    """Act on behalf of a user outside a Streamlit script (worker threads, benchmarks, warm-up)"""
+    previous = getattr(_call_context, "token", None)
+    _call_context.token = token
+    try:
+        yield
+    finally:
+        _call_context.token = previous
+
+
+def _run_with_token(token: Optional[str], call: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a manager call on a worker thread on behalf of the given user"""
+    with bound_token(token):
+        return call()
+
+
+def _coalesced(label: str) -> Callable[[Callable], Callable]:
+    """Share one backend read between identical concurrent calls on behalf of the same user
+    
+    Calls are keyed by (token, label, args). The token rather than its
+    unverified subject claim identifies the user, so a result is only ever
+    handed to a caller presenting the same credentials.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            key = (self.get_token(), label) + args
+            try:
+                return coalescer.do(key, lambda: method(self, *args), label)
+            except DeadlineExceeded as e:
+                return {"success": False, "error": f"Connection error: {str(e)}"}
+        return wrapper
+    return decorator
+
+
+def _forget_inflight(key: tuple, future: Future):
+    with _inflight_lock:
+        if _inflight_plans.get(key) is future:
+            del _inflight_plans[key]
 
 class GoalsManager:
     def __init__(self):
         self.api_base_url = API_BASE_URL
+        self.session = get_session()
         
+    def get_token(self) -> Optional[str]:
+        """Get the token for the current call, preferring one bound to a worker thread"""
+        token = getattr(_call_context, "token", None)
+        if token:
+            return token
+        return st.session_state.get("token")
+    
     def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers"""
-        token = st.session_state.get("token")
+        token = self.get_token()
         if not token:
             raise Exception("User not authenticated")
         return {"Authorization": f"Bearer {token}"}
     
+    def invalidate_goals_cache(self):
+        """Drop the cached goals list for the current user"""
+        token = self.get_token()
+        if token:
+            _invalidate_goals(token)
+    
+    def goals_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters for the goals cache"""
+        return _goals_cache.stats()
+    
+    def fetch_concurrently(self, calls: Dict[str, Callable[[], Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Run independent manager calls in parallel and return their results by name"""
+        token = self.get_token()
+        # Each call runs in a copy of this context so an active render trace follows it
+        futures = {
+            name: _fetch_pool.submit(contextvars.copy_context().run, _run_with_token, token, call)
+            for name, call in calls.items()
+        }
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = {"success": False, "error": f"Request failed: {str(e)}"}
+        return results
+    
     def create_goal(self, title: str, description: str, category: str, target_days: int) -> Dict[str, Any]:
         """Create a new learning goal"""
         try:
             headers = self.get_auth_headers()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/goals",
                 headers=headers,
                 json={
@@ -30,9 +251,10 @@ class GoalsManager:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                self.invalidate_goals_cache()
+                return {"success": True, "data": decode_body(response)}
             else:
-                return {"success": False, "error": response.json().get("detail", "Failed to create goal")}
+                return {"success": False, "error": decode_body(response).get("detail", "Failed to create goal")}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
@@ -40,23 +262,99 @@ class GoalsManager:
         """Get all goals for the current user"""
         try:
             headers = self.get_auth_headers()
-            response = requests.get(f"{self.api_base_url}/goals", headers=headers)
+            token = self.get_token()
+            cached = _goals_cache.get(token)
+            if cached is not None:
+                return {"success": True, "data": cached}
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+        return self._fetch_user_goals()
+    
+    def get_goal_store(self) -> Dict[str, Any]:
+        """Get the user's goals as a GoalStore shared by every page and session of the user
+        
+        The store is rebuilt only when get_user_goals returns a different list,
+        i.e. after the goals cache was refreshed or invalidated.
+        """
+        goals_result = self.get_user_goals()
+        if not goals_result["success"]:
+            return goals_result
+        return {"success": True, "data": _goal_store(self.get_token(), goals_result["data"])}
+    
+    @_coalesced("get_user_goals")
+    def _fetch_user_goals(self) -> Dict[str, Any]:
+        """Fetch the goals list from the backend and cache it"""
+        try:
+            headers = self.get_auth_headers()
+            response = self.session.get(f"{self.api_base_url}/goals", headers=headers)
+            
+            if response.status_code == 200:
+                goals = decode_body(response)
+                _goals_cache.set(self.get_token(), goals)
+                return {"success": True, "data": goals}
+            else:
+                return {"success": False, "error": "Failed to fetch goals"}
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+    
+    def get_goals_page(self, limit: int = GOALS_PAGE_SIZE, offset: int = 0,
+                       search: str = "", category: str = "") -> Dict[str, Any]:
+        """Get one page of the user's goals matching an optional search term and category
+        
+        data is {"items": [...], "total": <matching goals>}. Backends without
+        pagination return the whole list, which is then filtered and sliced here.
+        """
+        try:
+            self.get_auth_headers()
+            token = self.get_token()
+            cached = _goals_page_cache.get((token, limit, offset, search, category))
+            if cached is not None:
+                return {"success": True, "data": cached}
+            # The full list is already here; no need to ask for a page
+            goals = _goals_cache.get(token) if token in _goals_cache else None
+            if goals is not None:
+                return {"success": True, "data": _page_of_goals(_goal_store(token, goals), limit, offset, search, category)}
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+        return self._fetch_goals_page(limit, offset, search, category)
+    
+    @_coalesced("get_goals_page")
+    def _fetch_goals_page(self, limit: int, offset: int, search: str, category: str) -> Dict[str, Any]:
+        """Fetch a page of goals from the backend and cache it"""
+        try:
+            headers = self.get_auth_headers()
+            token = self.get_token()
+            params = {"limit": limit, "offset": offset}
+            if search:
+                params["q"] = search
+            if category:
+                params["category"] = category
+            response = self.session.get(f"{self.api_base_url}/goals", headers=headers, params=params)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                body = decode_body(response)
+                if isinstance(body, list):
+                    _goals_cache.set(token, body)
+                    page = _page_of_goals(_goal_store(token, body), limit, offset, search, category)
+                else:
+                    items = body.get("items", [])
+                    page = {"items": items, "total": body.get("total", offset + len(items))}
+                _goals_page_cache.set((token, limit, offset, search, category), page)
+                return {"success": True, "data": page}
             else:
                 return {"success": False, "error": "Failed to fetch goals"}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    @_coalesced("get_goal")
     def get_goal(self, goal_id: int) -> Dict[str, Any]:
         """Get a specific goal"""
         try:
             headers = self.get_auth_headers()
-            response = requests.get(f"{self.api_base_url}/goals/{goal_id}", headers=headers)
+            response = self.session.get(f"{self.api_base_url}/goals/{goal_id}", headers=headers)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": decode_body(response)}
             else:
                 return {"success": False, "error": "Failed to fetch goal"}
         except Exception as e:
@@ -66,14 +364,17 @@ class GoalsManager:
         """Update a goal"""
         try:
             headers = self.get_auth_headers()
-            response = requests.put(
+            response = self.session.put(
                 f"{self.api_base_url}/goals/{goal_id}",
                 headers=headers,
                 json=updates
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                self.invalidate_goals_cache()
+                token = self.get_token()
+                _plan_cache.invalidate_matching(lambda key: key[0] == token and key[1] == goal_id)
+                return {"success": True, "data": decode_body(response)}
             else:
                 return {"success": False, "error": "Failed to update goal"}
         except Exception as e:
@@ -81,68 +382,270 @@ class GoalsManager:
     
     def get_daily_plan(self, goal_id: int, day: int) -> Dict[str, Any]:
         """Get AI-generated daily plan"""
+        key = (self.get_token(), goal_id, day)
+        cached = _plan_cache.get(key)
+        if cached is not None:
+            return {"success": True, "data": cached}
+        
+        # A prefetch still queued behind others is cancelled; a running one is joined
+        # instead of generating the same plan twice, for at most the render's remaining budget
+        with _inflight_lock:
+            future = _inflight_plans.get(key)
+        if future is not None and not future.cancel():
+            deadline = current_deadline()
+            try:
+                return future.result(timeout=max(0.0, deadline.remaining()) if deadline else None)
+            except CancelledError:
+                pass
+            except FutureTimeoutError:
+                deadline.record_timeout("GET /goals/{id}/plan/{id}")
+                return {"success": False, "error": "Timed out waiting for the plan"}
+        return self._request_daily_plan(goal_id, day)
+    
+    @_coalesced("get_daily_plan")
+    def _request_daily_plan(self, goal_id: int, day: int) -> Dict[str, Any]:
+        """Load a daily plan from the persistent store or generate it on the backend, and memoize it"""
         try:
             headers = self.get_auth_headers()
-            response = requests.get(
+            key = (self.get_token(), goal_id, day)
+            version = self.get_goal_version(goal_id) if _plan_store else None
+            if version:
+                stored = _plan_store.get(goal_id, day, version)
+                if stored is not None:
+                    _plan_cache.set(key, stored)
+                    return {"success": True, "data": stored}
+            
+            response = self.session.get(
                 f"{self.api_base_url}/goals/{goal_id}/plan/{day}",
                 headers=headers
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                plan = decode_body(response)
+                _plan_cache.set(key, plan)
+                if version:
+                    _plan_store.put(goal_id, day, version, plan)
+                return {"success": True, "data": plan}
             else:
                 return {"success": False, "error": "Failed to generate plan"}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    def get_goal_version(self, goal_id: int) -> Optional[str]:
+        """Get a stamp that changes whenever the goal definition changes
+        
+        Only goals in the current user's goal list get a version, so stored
+        plans are never served for goals the user cannot see.
+        """
+        goals_result = self.get_user_goals()
+        if not goals_result["success"]:
+            return None
+        goal = next((goal for goal in goals_result["data"] if goal.get("id") == goal_id), None)
+        if goal is None:
+            return None
+        if goal.get("updated_at"):
+            return str(goal["updated_at"])
+        fields = {name: goal.get(name) for name in ("title", "description", "category", "target_days")}
+        return hashlib.sha1(json.dumps(fields, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def has_cached_daily_plan(self, goal_id: int, day: int) -> bool:
+        """Check whether a plan is ready without calling the backend"""
+        return (self.get_token(), goal_id, day) in _plan_cache
+    
+    def prefetch_daily_plans(self, goal_id: int, day: int, max_day: Optional[int] = None,
+                             count: int = PLAN_PREFETCH_DAYS) -> int:
+        """Generate plans for the days after `day` in the background, returning how many were queued"""
+        token = self.get_token()
+        if not token:
+            return 0
+        
+        last_day = day + count if max_day is None else min(day + count, max_day)
+        wanted = [(token, goal_id, d) for d in range(day + 1, last_day + 1)]
+        self.cancel_prefetch(keep=wanted)
+        return self._schedule_plans(wanted)
+    
+    def prefetch_current_plans(self) -> int:
+        """Generate the current-day plan of every active goal in the background, returning how many were queued"""
+        token = self.get_token()
+        store_result = self.get_goal_store()
+        if not token or not store_result["success"]:
+            return 0
+        return self._schedule_plans([
+            (token, goal["id"], max(1, goal.get("current_day") or 1))
+            for goal in store_result["data"].with_status("active")
+        ])
+    
+    def _schedule_plans(self, keys: List[tuple]) -> int:
+        """Queue (token, goal_id, day) plans on the prefetch pool unless cached, running or over the in-flight cap"""
+        scheduled = 0
+        with _inflight_lock:
+            for key in keys:
+                if key in _inflight_plans or key in _plan_cache:
+                    continue
+                if len(_inflight_plans) >= PLAN_PREFETCH_MAX_INFLIGHT:
+                    break
+                future = _prefetch_pool.submit(
+                    _run_with_token, key[0], lambda g=key[1], d=key[2]: self._request_daily_plan(g, d)
+                )
+                _inflight_plans[key] = future
+                future.add_done_callback(lambda f, k=key: _forget_inflight(k, f))
+                scheduled += 1
+        return scheduled
+    
+    def cancel_prefetch(self, keep: Optional[List[tuple]] = None) -> int:
+        """Cancel the current user's queued plan prefetches, returning how many were cancelled"""
+        token = self.get_token()
+        keep = set(keep or [])
+        cancelled = 0
+        with _inflight_lock:
+            for key, future in list(_inflight_plans.items()):
+                if key[0] == token and key not in keep and future.cancel():
+                    cancelled += 1
+        return cancelled
+    
+    def plan_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and prefetch queue size for daily plans"""
+        stats = _plan_cache.stats()
+        with _inflight_lock:
+            stats["prefetch_inflight"] = len(_inflight_plans)
+        if _plan_store:
+            stats["store"] = _plan_store.stats()
+        return stats
+    
     def log_progress(self, goal_id: int, day: int, topics_covered: List[str], 
                     hours_studied: float, problems_solved: int, 
                     confidence_level: int, notes: str = "") -> Dict[str, Any]:
         """Log daily progress"""
         try:
             headers = self.get_auth_headers()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/progress",
                 headers=headers,
-                json={
-                    "goal_id": goal_id,
-                    "day": day,
-                    "topics_covered": topics_covered,
-                    "hours_studied": hours_studied,
-                    "problems_solved": problems_solved,
-                    "confidence_level": confidence_level,
-                    "notes": notes
-                }
+                json=self._progress_payload(goal_id, day, topics_covered, hours_studied,
+                                            problems_solved, confidence_level, notes)
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                _invalidate_goals(self.get_token())
+                data = decode_body(response)
+                _record_progress(self.get_token(), goal_id, data)
+                return {"success": True, "data": data}
             else:
                 return {"success": False, "error": "Failed to log progress"}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    def queue_progress(self, goal_id: int, day: int, topics_covered: List[str],
+                       hours_studied: float, problems_solved: int,
+                       confidence_level: int, notes: str = "") -> Dict[str, Any]:
+        """Save progress locally and let the background worker deliver it
+        
+        Waits briefly (within the render's budget) for the delivery so AI
+        feedback can still be shown; on timeout the result is
+        {"success": True, "queued": True} and the entry keeps retrying in the
+        background. Falls back to log_progress when the queue is disabled.
+        """
+        if _progress_queue is None:
+            return self.log_progress(goal_id, day, topics_covered, hours_studied,
+                                     problems_solved, confidence_level, notes)
+        token = self.get_token()
+        if not token:
+            return {"success": False, "error": "Connection error: User not authenticated"}
+        try:
+            key = _progress_queue.enqueue(token, self._progress_payload(
+                goal_id, day, topics_covered, hours_studied, problems_solved, confidence_level, notes
+            ), self._progress_owner(token))
+        except Exception as e:
+            return {"success": False, "error": f"Failed to save progress locally: {str(e)}"}
+        
+        deadline = current_deadline()
+        wait = min(PROGRESS_QUEUE_ACK_WAIT, max(0.0, deadline.remaining())) if deadline else PROGRESS_QUEUE_ACK_WAIT
+        result = _progress_queue.wait_for(key, wait)
+        if result is None:
+            return {"success": True, "queued": True, "data": {}}
+        return {k: v for k, v in result.items() if k not in ("retryable", "unreachable")}
+    
+    @staticmethod
+    def _progress_owner(token: Optional[str]) -> str:
+        """Backend-verified id of the user, which their queued submissions are filed under"""
+        if not token:
+            return ""
+        user_result = AuthManager().get_current_user(token)
+        return str(user_result["data"].get("id", "")) if user_result["success"] else ""
+    
+    def failed_progress(self) -> List[Dict[str, Any]]:
+        """Get the current user's queued submissions that could not be delivered"""
+        if _progress_queue is None:
+            return []
+        return _progress_queue.failed(self._progress_owner(self.get_token()))
+    
+    def retry_failed_progress(self, key: str) -> bool:
+        """Queue a failed submission again with the current token"""
+        token = self.get_token()
+        if _progress_queue is None or not token:
+            return False
+        return _progress_queue.requeue(key, self._progress_owner(token), token)
+    
+    def discard_failed_progress(self, key: str) -> bool:
+        """Drop a failed submission the user no longer wants delivered"""
+        if _progress_queue is None:
+            return False
+        return _progress_queue.discard(key, self._progress_owner(self.get_token()))
+    
+    @staticmethod
+    def _progress_payload(goal_id: int, day: int, topics_covered: List[str],
+                          hours_studied: float, problems_solved: int,
+                          confidence_level: int, notes: str) -> Dict[str, Any]:
+        return {
+            "goal_id": goal_id,
+            "day": day,
+            "topics_covered": topics_covered,
+            "hours_studied": hours_studied,
+            "problems_solved": problems_solved,
+            "confidence_level": confidence_level,
+            "notes": notes
+        }
+    
+    def progress_queue_stats(self) -> Optional[Dict[str, Any]]:
+        """Get write-behind queue depth and flush latency, or None when disabled"""
+        return _progress_queue.stats() if _progress_queue else None
+    
+    @_coalesced("get_goal_progress")
     def get_goal_progress(self, goal_id: int) -> Dict[str, Any]:
-        """Get progress history for a goal"""
+        """Get progress history for a goal, downloading only entries newer than the local copy"""
         try:
             headers = self.get_auth_headers()
-            response = requests.get(
+            key = (self.get_token(), goal_id)
+            params = _progress_history.cursor_params(key)
+            response = self.session.get(
                 f"{self.api_base_url}/goals/{goal_id}/progress",
-                headers=headers
+                headers=headers,
+                params=params
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                entries = decode_body(response)
+                history, incremental = _progress_history.merge(key, entries, params.get("since_id"), wire_bytes(response))
+                _analytics.sync(key, entries if incremental else history, incremental)
+                return {"success": True, "data": history}
             else:
                 return {"success": False, "error": "Failed to fetch progress"}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    def coalescing_stats(self) -> Dict[str, Any]:
+        """Get how many backend reads ran and how many were collapsed into identical in-flight ones"""
+        return coalescer.stats()
+    
+    def progress_sync_stats(self) -> Dict[str, Any]:
+        """Get full/incremental sync counts and bytes transferred for progress history"""
+        return _progress_history.stats()
+    
     def chat_with_ai(self, goal_id: int, message: str) -> Dict[str, Any]:
         """Chat with AI learning coach"""
         try:
             headers = self.get_auth_headers()
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base_url}/chat",
                 headers=headers,
                 json={
@@ -152,21 +655,134 @@ class GoalsManager:
             )
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                return {"success": True, "data": decode_body(response)}
             else:
                 return {"success": False, "error": "Failed to get AI response"}
         except Exception as e:
             return {"success": False, "error": f"Connection error: {str(e)}"}
     
+    def stream_chat_with_ai(self, goal_id: int, message: str) -> Iterator[Dict[str, Any]]:
+        """Chat with AI learning coach, yielding the answer as it is generated
+        
+        Yields {"type": "token", "content": ...} events, then one final
+        {"type": "done", "success": ..., "data"/"error": ...} event whose data
+        has the same fields as chat_with_ai plus timing metrics.
+        """
+        started = time.perf_counter()
+        first_token_at = None
+        try:
+            headers = self.get_auth_headers()
+            headers["Accept"] = "text/event-stream"
+            response = self.session.post(
+                f"{self.api_base_url}/chat",
+                headers=headers,
+                json={
+                    "message": message,
+                    "goal_id": goal_id,
+                    "stream": True
+                },
+                stream=True
+            )
+            
+            with response:
+                if response.status_code != 200:
+                    yield {"type": "done", "success": False, "error": "Failed to get AI response"}
+                    return
+                
+                # Backends without streaming support answer with plain JSON
+                if not response.headers.get("Content-Type", "").startswith("text/event-stream"):
+                    data = decode_body(response)
+                    first_token_at = time.perf_counter()
+                    yield {"type": "token", "content": data.get("response", "")}
+                    data["metrics"] = self._stream_metrics(started, first_token_at)
+                    yield {"type": "done", "success": True, "data": data}
+                    return
+                
+                parts = []
+                final = {}
+                for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:].strip())
+                    if event.get("type") == "token":
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        parts.append(event.get("content", ""))
+                        yield {"type": "token", "content": event.get("content", "")}
+                    elif event.get("type") == "done":
+                        final = event
+                
+                data = {
+                    "response": final.get("response", "".join(parts)),
+                    "confidence": final.get("confidence", 0),
+                    "suggestions": final.get("suggestions", []),
+                    "metrics": self._stream_metrics(started, first_token_at)
+                }
+                yield {"type": "done", "success": True, "data": data}
+        except Exception as e:
+            yield {"type": "done", "success": False, "error": f"Connection error: {str(e)}"}
+    
+    @staticmethod
+    def _stream_metrics(started: float, first_token_at: Optional[float]) -> Dict[str, Optional[float]]:
+        """Build time-to-first-token and total duration for a streamed response, and record both"""
+        finished = time.perf_counter()
+        # The transport only times the response headers of a streamed call
+        if first_token_at is not None:
+            registry.observe_duration("chat_time_to_first_token_seconds", first_token_at - started,
+                                      {"endpoint": "POST /chat"})
+        registry.observe_duration("chat_stream_duration_seconds", finished - started, {"endpoint": "POST /chat"})
+        return {
+            "time_to_first_token": first_token_at - started if first_token_at is not None else None,
+            "total_time": finished - started
+        }
+    
     def get_analytics(self) -> Dict[str, Any]:
-        """Get user analytics"""
+        """Get user analytics
+        
+        When the progress logs of all the user's goals have been fetched,
+        total study hours and average confidence are computed from them; the
+        other fields always come from the backend. A cached /analytics
+        response is only reused while none of the user's data changed since.
+        """
+        if not ANALYTICS_LOCAL_ENABLED:
+            return self._fetch_analytics()
+        try:
+            headers = self.get_auth_headers()
+            token = self.get_token()
+        except Exception as e:
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+        
+        goals_result = self.get_user_goals()
+        local = _analytics.aggregates(token, [goal["id"] for goal in goals_result["data"]]) \
+            if goals_result["success"] else None
+        cached = _analytics_cache.get(token)
+        if cached is not None and cached[0] == data_versions.get(token):
+            data = cached[1]
+        else:
+            result = self._fetch_analytics()
+            if not result["success"]:
+                return result
+            data = result["data"]
+        return {"success": True, "data": dict(data, **local) if local else data}
+    
+    @_coalesced("get_analytics")
+    def _fetch_analytics(self) -> Dict[str, Any]:
+        """Fetch /analytics from the backend and cache it with the user's current data version"""
         try:
             headers = self.get_auth_headers()
-            response = requests.get(f"{self.api_base_url}/analytics", headers=headers)
+            version = data_versions.get(self.get_token())
+            response = self.session.get(f"{self.api_base_url}/analytics", headers=headers)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                data = decode_body(response)
+                if ANALYTICS_LOCAL_ENABLED:
+                    _analytics_cache.set(self.get_token(), (version, data))
+                return {"success": True, "data": data}
             else:
                 return {"success": False, "error": "Failed to fetch analytics"}
         except Exception as e:
-            return {"success": False, "error": f"Connection error: {str(e)}"} 
\ No newline at end of file
+            return {"success": False, "error": f"Connection error: {str(e)}"}
+    
+    def analytics_stats(self) -> Dict[str, Any]:
+        """Get how much progress history the local analytics cover"""
+        return dict(_analytics.stats(), analytics_cache=_analytics_cache.stats())
@@ -0,0 +1,142 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from typing import Any, Optional
+from config import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK, HTTP_MAX_RETRIES,
+    RESPONSE_COMPRESSION, RESPONSE_MSGPACK,
+    HTTP_TIMEOUT_SECONDS, HTTP_ENDPOINT_TIMEOUTS, CIRCUIT_BREAKER_SLOW_CALL_RATIO
+)
+from circuit_breaker import breaker
+from deadline import DeadlineExceeded, current_deadline
+from metrics import registry, endpoint_label
+from profiler import span
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+HEALTH_ENDPOINT = "GET /health"
+MSGPACK_CONTENT_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def decode_body(response: requests.Response) -> Any:
+    """Decode a response body by its Content-Type: MessagePack if negotiated, JSON otherwise"""
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if msgpack is not None and content_type in MSGPACK_CONTENT_TYPES:
+        return msgpack.unpackb(response.content, raw=False)
+    return response.json()
+
+
+def wire_bytes(response: requests.Response) -> int:
+    """Body size as received on the wire, before any Content-Encoding was undone"""
+    content = response.content
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return len(content)
+
+
+class BackendSession(requests.Session):
+    """Keep-alive HTTP session shared by all backend managers"""
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 pool_block: bool = HTTP_POOL_BLOCK,
+                 max_retries: int = HTTP_MAX_RETRIES):
+        super().__init__()
+        # One urllib3 pool per backend host, each holding up to pool_maxsize sockets
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        # requests advertises br only when a brotli package is installed
+        self.headers["Accept-Encoding"] = DEFAULT_ACCEPT_ENCODING if RESPONSE_COMPRESSION else "identity"
+        if RESPONSE_MSGPACK and msgpack is not None:
+            self.headers["Accept"] = "application/msgpack, application/json;q=0.9"
+
+    def request(self, method, url, *args, **kwargs):
+        """Send a request within its timeout and record its latency, size and outcome per endpoint"""
+        endpoint = endpoint_label(method, url)
+        deadline = current_deadline()
+        requested = kwargs.get("timeout")
+        try:
+            kwargs["timeout"] = self.timeout_for(endpoint, requested)
+        except DeadlineExceeded:
+            registry.increment("backend_timeouts_total", {"endpoint": endpoint})
+            deadline.record_timeout(endpoint)
+            raise
+        # Health checks bypass the breaker: they are how it learns the backend is back
+        guarded = breaker is not None and endpoint != HEALTH_ENDPOINT
+        if guarded:
+            breaker.before_call(endpoint)
+        
+        started = time.perf_counter()
+        try:
+            with span(endpoint, "backend"):
+                response = super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            registry.observe_request(endpoint, time.perf_counter() - started, 0, error=True)
+            # A timeout shortened by this render's budget says nothing about the backend
+            budget_capped = kwargs["timeout"] != self.timeout_for(endpoint, requested, capped=False)
+            if guarded and isinstance(e, requests.exceptions.Timeout) and budget_capped:
+                breaker.release()
+            elif guarded:
+                breaker.record(failed=True)
+            if isinstance(e, requests.exceptions.Timeout):
+                registry.increment("backend_timeouts_total", {"endpoint": endpoint})
+                if deadline is not None:
+                    deadline.record_timeout(endpoint)
+            raise
+        
+        if kwargs.get("stream"):
+            # Body not read yet; rely on the declared length
+            nbytes = int(response.headers.get("Content-Length") or 0)
+        else:
+            nbytes = wire_bytes(response)
+        elapsed = time.perf_counter() - started
+        registry.observe_request(endpoint, elapsed, nbytes, error=response.status_code >= 400)
+        if guarded:
+            # Slowness is judged against the endpoint's own timeout, not one cut down by a render budget
+            timeout = HTTP_ENDPOINT_TIMEOUTS.get(endpoint, HTTP_TIMEOUT_SECONDS)
+            limit = max(timeout) if isinstance(timeout, tuple) else timeout
+            breaker.record(failed=response.status_code >= 500,
+                           slow=elapsed >= limit * CIRCUIT_BREAKER_SLOW_CALL_RATIO)
+        return response
+
+    @staticmethod
+    def timeout_for(endpoint: str, timeout=None, capped: bool = True):
+        """Endpoint default (or the caller's timeout), capped by what is left of the render's budget"""
+        if timeout is None:
+            timeout = HTTP_ENDPOINT_TIMEOUTS.get(endpoint, HTTP_TIMEOUT_SECONDS)
+        deadline = current_deadline()
+        if deadline is None or not capped:
+            return timeout
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Time budget for this page ran out before {endpoint}")
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+
+_session: Optional[BackendSession] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> BackendSession:
+    """Get the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = BackendSession()
+    return _session
+
@@ -0,0 +1,247 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Upper bounds in seconds for the Prometheus latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+# Label pairs of a series, sorted by label name, e.g. (("outcome", "ok"), ("step", "goals"))
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint_label(method: str, url: str) -> str:
+    """Collapse a request into an endpoint name, e.g. 'GET /goals/{id}/plan/{id}'"""
+    path = urlparse(url).path or "/"
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class EndpointStats:
+    """Latency histogram, recent samples, bytes and error counts for one endpoint"""
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.errors = 0
+        self.bytes_total = 0
+        self.latency_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples = deque(maxlen=sample_size)
+
+    def observe(self, seconds: float, nbytes: int, error: bool):
+        self.count += 1
+        self.errors += int(error)
+        self.bytes_total += nbytes
+        self.latency_sum += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+
+class MetricsRegistry:
+    """Process-wide registry of backend call metrics"""
+
+    def __init__(self, sample_size: int = 1024):
+        self.sample_size = sample_size
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._durations: Dict[Tuple[str, Labels], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def observe_request(self, endpoint: str, seconds: float, nbytes: int, error: bool):
+        """Record one backend call"""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats(self.sample_size)
+            stats.observe(seconds, nbytes, error)
+
+    def observe_duration(self, name: str, seconds: float, labels: Optional[Dict[str, str]] = None):
+        """Record a client-side timing that is not a whole backend call, e.g. time to first chat token"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            stats = self._durations.get(key)
+            if stats is None:
+                stats = self._durations[key] = EndpointStats(self.sample_size)
+            stats.observe(seconds, 0, False)
+
+    def increment(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1):
+        """Add to a named counter, optionally per set of labels, e.g. {"endpoint": "GET /goals"}"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Set a named gauge, optionally per set of labels"""
+        with self._lock:
+            self._gauges[(name, _label_key(labels))] = value
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-endpoint summary rows, slowest p95 first"""
+        with self._lock:
+            rows = []
+            for endpoint, stats in self._endpoints.items():
+                samples = sorted(stats.samples)
+                rows.append({
+                    "endpoint": endpoint,
+                    "calls": stats.count,
+                    "p50_ms": percentile(samples, 50) * 1000,
+                    "p95_ms": percentile(samples, 95) * 1000,
+                    "p99_ms": percentile(samples, 99) * 1000,
+                    "avg_bytes": stats.bytes_total / stats.count if stats.count else 0,
+                    "error_rate": stats.errors / stats.count if stats.count else 0.0
+                })
+        return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+    def duration_snapshot(self) -> List[Dict[str, Any]]:
+        """Summary rows of the recorded client-side timings"""
+        with self._lock:
+            rows = []
+            for (name, labels), stats in sorted(self._durations.items()):
+                samples = sorted(stats.samples)
+                rows.append({
+                    "timing": name,
+                    "labels": ", ".join(f"{label}={value}" for label, value in labels),
+                    "count": stats.count,
+                    "p50_ms": percentile(samples, 50) * 1000,
+                    "p95_ms": percentile(samples, 95) * 1000,
+                    "p99_ms": percentile(samples, 99) * 1000
+                })
+        return rows
+
+    def counters(self) -> Dict[Tuple[str, Labels], float]:
+        """Copy of all counters keyed by (name, labels)"""
+        with self._lock:
+            return dict(self._counters)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP backend_request_duration_seconds Backend call latency.",
+            "# TYPE backend_request_duration_seconds histogram"
+        ]
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            for endpoint, stats in endpoints:
+                label = _escape(endpoint)
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'backend_request_duration_seconds_bucket{{endpoint="{label}",le="{bound}"}} {count}')
+                lines.append(f'backend_request_duration_seconds_bucket{{endpoint="{label}",le="+Inf"}} {stats.count}')
+                lines.append(f'backend_request_duration_seconds_sum{{endpoint="{label}"}} {stats.latency_sum}')
+                lines.append(f'backend_request_duration_seconds_count{{endpoint="{label}"}} {stats.count}')
+            lines.append("# TYPE backend_request_errors_total counter")
+            for endpoint, stats in endpoints:
+                lines.append(f'backend_request_errors_total{{endpoint="{_escape(endpoint)}"}} {stats.errors}')
+            lines.append("# TYPE backend_response_bytes_total counter")
+            for endpoint, stats in endpoints:
+                lines.append(f'backend_response_bytes_total{{endpoint="{_escape(endpoint)}"}} {stats.bytes_total}')
+            for name in sorted({name for name, _ in self._durations}):
+                lines.append(f"# TYPE {name} histogram")
+                for (series_name, labels), stats in sorted(self._durations.items()):
+                    if series_name != name:
+                        continue
+                    for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {stats.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {stats.latency_sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {stats.count}")
+            lines.extend(_render_series(self._counters, "counter"))
+            lines.extend(_render_series(self._gauges, "gauge"))
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((label, str(value)) for label, value in (labels or {}).items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{label}="{_escape(value)}"' for label, value in labels) + "}"
+
+
+def _render_series(series: Dict[Tuple[str, Labels], float], kind: str) -> List[str]:
+    lines = []
+    for name in sorted({name for name, _ in series}):
+        lines.append(f"# TYPE {name} {kind}")
+        for (series_name, labels), value in sorted(series.items()):
+            if series_name != name:
+                continue
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+    return lines
+
+
+# Global metrics registry
+registry = MetricsRegistry()
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.to_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def write_prometheus(path: str):
+    """Atomically write the current metrics to a text file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(registry.to_prometheus())
+    os.replace(tmp_path, path)
+
+
+def start_exporters(port: int = 0, export_path: Optional[str] = None, interval: float = 15.0):
+    """Start the /metrics endpoint and/or periodic file export once per process"""
+    global _exporters_started
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+    if port:
+        try:
+            server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        except OSError as e:
+            print(f"Metrics endpoint unavailable: {e}")
+
+    if export_path:
+        def export_loop():
+            while True:
+                try:
+                    write_prometheus(export_path)
+                except OSError as e:
+                    print(f"Metrics export failed: {e}")
+                time.sleep(interval)
+        threading.Thread(target=export_loop, name="metrics-export", daemon=True).start()
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import streamlit as st
+
+from config import PAGE_MEMO_ENABLED, PAGE_MEMO_TTL_SECONDS
+from metrics import registry
+
+
+class DataVersions:
+    """Per-user counters bumped on every write; memoized page data from an older version is reloaded"""
+
+    def __init__(self):
+        self._versions: Dict[Optional[str], int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: Optional[str]) -> int:
+        with self._lock:
+            return self._versions.get(token, 0)
+
+    def bump(self, token: Optional[str]):
+        with self._lock:
+            self._versions[token] = self._versions.get(token, 0) + 1
+
+
+# Shared by every session, so a write in one tab (or by the progress queue worker) reaches all of them
+data_versions = DataVersions()
+
+
+class PageMemo:
+    """A session's page data loads, reused across reruns while their inputs and the user's data are unchanged"""
+
+    def __init__(self, ttl: float, max_entries: int = 32):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: int, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return the stored result for key, or call load() and store it if it succeeded"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+            self.hits += 1
+            self._entries.move_to_end(key)
+            registry.increment("page_memo_hits_total", {"page": key[0]})
+            return entry[2]
+        self.misses += 1
+        registry.increment("page_memo_misses_total", {"page": key[0]})
+        result = load()
+        if result.get("success"):
+            self._entries[key] = (version, time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.pop(key, None)
+        return result
+
+    def invalidate(self, page: Optional[str] = None):
+        """Drop the stored results of one page, or of all pages"""
+        for key in [key for key in self._entries if page is None or key[0] == page]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of stored results"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entries)
+        }
+
+
+def _session_memo() -> PageMemo:
+    if "page_memo" not in st.session_state:
+        st.session_state.page_memo = PageMemo(PAGE_MEMO_TTL_SECONDS)
+    return st.session_state.page_memo
+
+
+def memoized(page: str, inputs: tuple, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Load a page's data, skipping the load on reruns where the user, the inputs and the data are unchanged
+
+    inputs are the widget values the data depends on (e.g. the selected goal);
+    widgets that only shape a form leave the stored result in place.
+    """
+    if not PAGE_MEMO_ENABLED:
+        return load()
+    token = st.session_state.get("token")
+    return _session_memo().get((page, token) + inputs, data_versions.get(token), load)
+
+
+def invalidate_page_data(token: Optional[str]):
+    """Make every session of the user reload its page data on the next rerun"""
+    data_versions.bump(token)
+
+
+def page_memo_stats() -> Dict[str, Any]:
+    """Get the current session's page memo counters"""
+    return _session_memo().stats()
@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class PlanStore:
+    """SQLite-backed LRU store of generated daily plans that survives restarts"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS plans (
+                goal_id INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                version TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (goal_id, day)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plans_last_access ON plans (last_access)")
+        self._conn.commit()
+
+    def warm_start(self) -> Dict[str, Any]:
+        """Bring a store left by a previous process back within budget and report its contents"""
+        with self._lock:
+            self._evict()
+            self._conn.commit()
+        return self.stats()
+
+    def get(self, goal_id: int, day: int, version: str) -> Optional[Dict[str, Any]]:
+        """Get a stored plan generated for this version of the goal"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM plans WHERE goal_id = ? AND day = ? AND version = ?",
+                (goal_id, day, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE plans SET last_access = ? WHERE goal_id = ? AND day = ?",
+                (time.time(), goal_id, day)
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, goal_id: int, day: int, version: str, plan: Dict[str, Any]):
+        """Store a plan, replacing any plan generated for an older goal version"""
+        payload = json.dumps(plan)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plans (goal_id, day, version, payload, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (goal_id, day, version, payload, len(payload), time.time())
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used plans until the store fits in max_bytes"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM plans").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT goal_id, day, size FROM plans ORDER BY last_access").fetchall()
+        for goal_id, day, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM plans WHERE goal_id = ? AND day = ?", (goal_id, day))
+            total -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count, stored bytes and hit/miss counters"""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM plans"
+            ).fetchone()
+            return {
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -0,0 +1,102 @@
+import contextvars
+import functools
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class RenderTrace:
+    """Spans collected during one script rerun, in Chrome trace event format"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:8]
+        self.started = time.perf_counter()
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, category: str, started: float, finished: float,
+                 args: Optional[Dict[str, Any]] = None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started - self.started) * 1e6,
+            "dur": (finished - started) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args or {}
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "metadata": {"name": self.name, "trace_id": self.trace_id}
+        }
+
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("render_trace", default=None)
+
+
+@contextmanager
+def span(name: str, category: str = "render", **args) -> Iterator[None]:
+    """Time a block as a span of the active trace; free when profiling is off"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, category, started, time.perf_counter(), args)
+
+
+def profiled(func: Callable) -> Callable:
+    """Record each call of a render function as a span"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__, "render"):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@contextmanager
+def render_trace(enabled: bool, output_dir: str, name: str = "rerun", max_files: int = 200) -> Iterator[Optional[RenderTrace]]:
+    """Collect spans for one rerun and write them to output_dir as Chrome trace JSON"""
+    if not enabled:
+        yield None
+        return
+    trace = RenderTrace(name)
+    token = _current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.add_span(name, "rerun", started, time.perf_counter())
+        _current_trace.reset(token)
+        try:
+            _write_trace(trace, output_dir, max_files)
+        except OSError as e:
+            print(f"Failed to write render trace: {e}")
+
+
+def _write_trace(trace: RenderTrace, output_dir: str, max_files: int):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{trace.trace_id}.json")
+    with open(path, "w") as f:
+        json.dump(trace.to_chrome_trace(), f)
+    # Keep the newest max_files traces
+    traces = sorted(glob.glob(os.path.join(output_dir, "trace-*.json")), key=os.path.getmtime)
+    for old_path in traces[:-max_files]:
+        os.remove(old_path)
@@ -0,0 +1,241 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# sender(token, payload, idempotency_key) -> {"success", "data"/"error", "retryable", "unreachable"}
+# unreachable: the request never reached the backend (e.g. circuit open, connection refused)
+Sender = Callable[[str, Dict[str, Any], str], Dict[str, Any]]
+
+
+class ProgressQueue:
+    """Durable write-behind queue that flushes progress submissions to the backend
+    
+    A single worker picks due submissions and hands them to a small pool of
+    senders, so one slow POST does not hold up submissions from other sessions.
+    Only attempts the backend actually answered (or timed out on) count towards
+    max_attempts, so an outage alone never makes a submission fail.
+    """
+
+    def __init__(self, path: str, sender: Sender, batch_size: int = 20, max_attempts: int = 8,
+                 flush_interval: float = 2.0, max_concurrency: int = 4):
+        self.path = path
+        self.sender = sender
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._senders = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="progress-send")
+        self._in_flight: Set[int] = set()
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._result_ready = threading.Condition(self._lock)
+        self.flushed_total = 0
+        self.last_flush_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        # Pending rows hold bearer tokens, so the database is private to this user
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        os.chmod(path, 0o600)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queued_progress (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                token TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                last_error TEXT,
+                owner TEXT NOT NULL DEFAULT ''
+            )
+        """)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(queued_progress)")]
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE queued_progress ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+        # Tokens of settled rows are not needed; scrub any left by older versions
+        self._conn.execute("UPDATE queued_progress SET token = '' WHERE status = 'failed'")
+        self._conn.commit()
+
+    def enqueue(self, token: str, payload: Dict[str, Any], owner: str = "") -> str:
+        """Persist a submission and wake the flush worker; returns its idempotency key
+        
+        owner identifies the user so their failed submissions can be shown to
+        them once the token has been scrubbed.
+        """
+        key = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO queued_progress (idempotency_key, token, payload, next_attempt_at, created_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, token, json.dumps(payload), now, now, owner)
+            )
+            self._conn.commit()
+        self.start()
+        self._wake.set()
+        return key
+
+    def wait_for(self, key: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """Wait up to timeout seconds for a submission to be flushed, returning the sender result"""
+        deadline = time.monotonic() + timeout
+        with self._result_ready:
+            while key not in self._results:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._result_ready.wait(remaining)
+            return self._results[key]
+
+    def start(self):
+        """Start the background flush worker if it is not running"""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="progress-flush", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            try:
+                dispatched = self.flush()
+            except Exception as e:
+                self.last_error = str(e)
+                dispatched = 0
+            # Keep dispatching while there is a backlog, otherwise sleep until
+            # woken by a new submission or a finished delivery
+            if not dispatched:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+
+    def flush(self) -> int:
+        """Hand due submissions to the sender pool, up to batch_size in flight; returns how many were dispatched"""
+        with self._lock:
+            room = self.batch_size - len(self._in_flight)
+            if room <= 0:
+                return 0
+            rows = self._conn.execute(
+                "SELECT id, idempotency_key, token, payload, attempts FROM queued_progress "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (time.time(), room + len(self._in_flight))
+            ).fetchall()
+            rows = [row for row in rows if row[0] not in self._in_flight][:room]
+            self._in_flight.update(row[0] for row in rows)
+        for row in rows:
+            self._senders.submit(self._deliver, *row)
+        return len(rows)
+
+    def _deliver(self, row_id: int, key: str, token: str, payload: str, attempts: int):
+        """Send one submission and record the outcome"""
+        started = time.perf_counter()
+        try:
+            result = self.sender(token, json.loads(payload), key)
+        except Exception as e:
+            result = {"success": False, "error": str(e), "retryable": True}
+        with self._lock:
+            settled = True
+            if result["success"]:
+                self._conn.execute("DELETE FROM queued_progress WHERE id = ?", (row_id,))
+                self.flushed_total += 1
+            elif result.get("unreachable") or (result.get("retryable") and attempts + 1 < self.max_attempts):
+                # Not sent at all: wait for the backend to come back without using up an attempt
+                counted = 0 if result.get("unreachable") else 1
+                backoff = min(60.0, 2.0 ** attempts)
+                self._conn.execute(
+                    "UPDATE queued_progress SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                    (attempts + counted, time.time() + backoff, result.get("error"), row_id)
+                )
+                self.last_error = result.get("error")
+                settled = False
+            else:
+                # Rejected by the backend or out of retries; keep it for inspection,
+                # minus the bearer token, which is no longer needed
+                self._conn.execute(
+                    "UPDATE queued_progress SET status = 'failed', token = '', attempts = ?, last_error = ? "
+                    "WHERE id = ?",
+                    (attempts + 1, result.get("error"), row_id)
+                )
+                self.last_error = result.get("error")
+            self._conn.commit()
+            self._in_flight.discard(row_id)
+            self.last_flush_seconds = time.perf_counter() - started
+            if settled:
+                self._results[key] = result
+                while len(self._results) > 256:
+                    self._results.popitem(last=False)
+                self._result_ready.notify_all()
+        self._wake.set()
+
+    def pending_count(self) -> int:
+        """Number of submissions not yet accepted by the backend"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM queued_progress WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def failed(self, owner: str) -> List[Dict[str, Any]]:
+        """Submissions of one user that were rejected or ran out of attempts, oldest first"""
+        if not owner:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT idempotency_key, payload, last_error, created_at FROM queued_progress "
+                "WHERE status = 'failed' AND owner = ? ORDER BY id",
+                (owner,)
+            ).fetchall()
+        return [
+            {"key": key, "payload": json.loads(payload), "error": error, "created_at": created_at}
+            for key, payload, error, created_at in rows
+        ]
+
+    def requeue(self, key: str, owner: str, token: str) -> bool:
+        """Send a failed submission again with the user's current token; False if it is not theirs"""
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE queued_progress SET status = 'pending', token = ?, attempts = 0, next_attempt_at = ? "
+                "WHERE idempotency_key = ? AND owner = ? AND status = 'failed'",
+                (token, time.time(), key, owner)
+            ).rowcount
+            self._conn.commit()
+        if updated:
+            self.start()
+            self._wake.set()
+        return bool(updated)
+
+    def discard(self, key: str, owner: str) -> bool:
+        """Delete a failed submission of the user; False if it is not theirs"""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM queued_progress WHERE idempotency_key = ? AND owner = ? AND status = 'failed'",
+                (key, owner)
+            ).rowcount
+            self._conn.commit()
+        return bool(deleted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth, failures and flush latency"""
+        with self._lock:
+            pending, failed, oldest = self._conn.execute(
+                "SELECT SUM(status = 'pending'), SUM(status = 'failed'), "
+                "MIN(CASE WHEN status = 'pending' THEN created_at END) FROM queued_progress"
+            ).fetchone()
+        return {
+            "pending": pending or 0,
+            "failed": failed or 0,
+            "oldest_pending_age": time.time() - oldest if oldest else 0.0,
+            "in_flight": len(self._in_flight),
+            "flushed_total": self.flushed_total,
+            "last_flush_seconds": self.last_flush_seconds,
+            "last_error": self.last_error
+        }
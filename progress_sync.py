@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+class ProgressHistoryStore:
+    """Local append-only copies of per-goal progress logs, synced with a since_id cursor"""
+
+    def __init__(self, full_refresh_seconds: float, max_goals: int = 256):
+        self.full_refresh_seconds = full_refresh_seconds
+        self.max_goals = max_goals
+        self._logs: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.bytes_fetched = 0
+        self.last_fetch_bytes = 0
+
+    def cursor_params(self, key: Hashable) -> Dict[str, Any]:
+        """Query params for an incremental fetch, or {} when a full refresh is due"""
+        with self._lock:
+            log = self._logs.get(key)
+            if log is None or log["cursor"] is None:
+                return {}
+            if time.monotonic() - log["refreshed_at"] > self.full_refresh_seconds:
+                return {}
+            return {"since_id": log["cursor"]}
+
+    def merge(self, key: Hashable, entries: List[Dict[str, Any]], since_id: Any,
+              nbytes: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fold a fetched page into the local log; returns the full history and whether the page was incremental"""
+        with self._lock:
+            self.bytes_fetched += nbytes
+            self.last_fetch_bytes = nbytes
+            log = self._logs.get(key)
+            # A backend that ignores since_id sends the whole history back
+            incremental = (
+                since_id is not None and log is not None
+                and all(entry.get("id") is not None and entry["id"] > since_id for entry in entries)
+            )
+            if incremental:
+                self.incremental_syncs += 1
+                log["entries"].extend(entries)
+            else:
+                self.full_syncs += 1
+                log = {"entries": list(entries), "refreshed_at": time.monotonic()}
+                self._logs[key] = log
+
+            ids = [entry.get("id") for entry in log["entries"]]
+            log["cursor"] = max(ids) if ids and None not in ids else None
+            self._logs.move_to_end(key)
+            while len(self._logs) > self.max_goals:
+                self._logs.popitem(last=False)
+            return list(log["entries"]), incremental
+
+    def invalidate(self, key: Hashable):
+        """Drop a goal's local log so the next fetch is a full refresh"""
+        with self._lock:
+            self._logs.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get sync counters and bytes transferred"""
+        with self._lock:
+            return {
+                "goals": len(self._logs),
+                "full_syncs": self.full_syncs,
+                "incremental_syncs": self.incremental_syncs,
+                "bytes_fetched": self.bytes_fetched,
+                "last_fetch_bytes": self.last_fetch_bytes
+            }
@@ -1,5 +1,15 @@
 import streamlit as st
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from config import CHAT_HISTORY_WINDOW, CHAT_HISTORY_PATH, CHAT_HISTORY_MAX_AGE_SECONDS
+from chat_history import ChatHistory, ChatSpillStore
+
+# Chat messages that no longer fit a session's in-memory window
+_chat_spill_store: Optional[ChatSpillStore] = None
+try:
+    _chat_spill_store = ChatSpillStore(CHAT_HISTORY_PATH, CHAT_HISTORY_MAX_AGE_SECONDS)
+except Exception as e:
+    print(f"Chat history store unavailable: {e}")
 
 
 class SessionStateManager:
@@ -9,7 +19,7 @@ class SessionStateManager:
     def initialize():
         """Initialize session state variables"""
         if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
+            st.session_state.chat_history = ChatHistory(CHAT_HISTORY_WINDOW, _chat_spill_store)
         
         if "current_day" not in st.session_state:
             st.session_state.current_day = 1
@@ -21,26 +31,36 @@ class SessionStateManager:
                 "notifications": True
             }
     
+    @staticmethod
+    def _chat_history() -> ChatHistory:
+        if "chat_history" not in st.session_state:
+            st.session_state.chat_history = ChatHistory(CHAT_HISTORY_WINDOW, _chat_spill_store)
+        return st.session_state.chat_history
+    
     @staticmethod
     def get_chat_history() -> List[Dict[str, Any]]:
-        """Get chat history"""
-        return st.session_state.get("chat_history", [])
+        """Get the most recent chat messages kept in memory"""
+        return SessionStateManager._chat_history().recent()
+    
+    @staticmethod
+    def get_older_chat_messages(before_seq: int, limit: int) -> List[Dict[str, Any]]:
+        """Page earlier chat messages back in from disk"""
+        return SessionStateManager._chat_history().older(before_seq, limit)
+    
+    @staticmethod
+    def get_chat_message_count() -> int:
+        """Get the number of chat messages, including those spilled to disk"""
+        return len(SessionStateManager._chat_history())
     
     @staticmethod
     def add_chat_message(role: str, content: str):
         """Add message to chat history"""
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = []
-        
-        st.session_state.chat_history.append({
-            "role": role,
-            "content": content
-        })
+        SessionStateManager._chat_history().append(role, content)
     
     @staticmethod
     def clear_chat_history():
         """Clear chat history"""
-        st.session_state.chat_history = []
+        SessionStateManager._chat_history().clear()
     
     @staticmethod
     def get_current_day() -> int:
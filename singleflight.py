@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from deadline import DeadlineExceeded, current_deadline
+from metrics import registry
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse identical concurrent calls into one; callers arriving mid-flight share its result"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any], label: str = "") -> Any:
+        """Run func for key, or wait for the identical call already in flight
+
+        key should identify the user, the method and its arguments. label
+        names the call in the singleflight_* metrics. A caller waiting on
+        another's call waits at most for the rest of its render's budget, as
+        the leader may be a background thread without one.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            registry.increment("singleflight_collapsed_total", {"call": label})
+            deadline = current_deadline()
+            if not call.done.wait(max(0.0, deadline.remaining()) if deadline else None):
+                registry.increment("singleflight_timeouts_total", {"call": label})
+                deadline.record_timeout(label)
+                raise DeadlineExceeded(f"Time budget for this page ran out waiting for {label}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        registry.increment("singleflight_executed_total", {"call": label})
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get executed/collapsed call counts and the number of calls in flight"""
+        with self._lock:
+            total = self.executed + self.collapsed
+            return {
+                "executed": self.executed,
+                "collapsed": self.collapsed,
+                "collapse_rate": self.collapsed / total if total else 0.0,
+                "in_flight": len(self._calls)
+            }
+
+
+# Process-wide coalescer for backend reads shared by all sessions
+coalescer = SingleFlight()
@@ -0,0 +1,382 @@
+"""Local stand-in for the learning assistant backend.
+
+Run with ``python stub_backend.py --port 8000`` and point the app at it with
+``BACKEND_URL=http://localhost:8000``. It implements every endpoint the
+managers call, keeps state in memory and serves canned content. Latency and
+payload sizes are configurable so client-side behaviour (streaming, caching,
+pooling) can be measured. JSON bodies are compressed (gzip, or br when
+brotli is installed) and sent as MessagePack (when msgpack is installed)
+if the request's Accept-Encoding / Accept headers ask for it.
+"""
+import argparse
+import base64
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Bodies smaller than this are sent uncompressed, as most servers do
+COMPRESSION_MIN_BYTES = 1024
+
+CHAT_ANSWER = (
+    "Break the topic into small daily sessions, review yesterday's notes before "
+    "starting, and finish each session with two practice problems to check recall."
+)
+
+
+def make_token(subject: str, lifetime: float = 3600) -> str:
+    """Build an unsigned JWT-shaped token carrying sub, exp and a unique jti"""
+    def encode(part: Dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode("utf-8")).decode("ascii").rstrip("=")
+    claims = {"sub": subject, "exp": int(time.time() + lifetime), "jti": uuid.uuid4().hex}
+    return f"{encode({'alg': 'none', 'typ': 'JWT'})}.{encode(claims)}.stub"
+
+
+class StubState:
+    """In-memory goals, progress logs and users served by the stub"""
+
+    def __init__(self, goals: int = 5, progress_entries: int = 30, plan_items: int = 5):
+        self.plan_items = plan_items
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.users = {"demo@example.com": {"id": 1, "email": "demo@example.com", "username": "demo",
+                                           "full_name": "Demo User", "password": "demo"}}
+        self.goals: List[Dict[str, Any]] = []
+        self.progress: Dict[int, List[Dict[str, Any]]] = {}
+        self.idempotency_keys: Dict[str, Dict[str, Any]] = {}
+        for i in range(goals):
+            goal = self.add_goal(f"Goal {i + 1}", "Practice every day", "coding", 30)
+            for day in range(1, progress_entries + 1):
+                self.add_progress({"goal_id": goal["id"], "day": day, "topics_covered": ["Topic 1"],
+                                   "hours_studied": 1.0 + day % 4, "problems_solved": day % 5,
+                                   "confidence_level": min(100, 40 + day), "notes": ""})
+
+    def add_goal(self, title: str, description: str, category: str, target_days: int) -> Dict[str, Any]:
+        goal = {"id": next(self.ids), "title": title, "description": description, "category": category,
+                "target_days": target_days, "current_day": 1, "status": "active",
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self.goals.append(goal)
+        self.progress[goal["id"]] = []
+        return goal
+
+    def add_progress(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        entry = dict(payload, id=next(self.ids))
+        self.progress.setdefault(payload["goal_id"], []).append(entry)
+        for goal in self.goals:
+            if goal["id"] == payload["goal_id"]:
+                goal["current_day"] = max(goal["current_day"], payload["day"])
+        return entry
+
+    def plan(self, goal_id: int, day: int) -> Dict[str, Any]:
+        topics = [f"Day {day} topic {i + 1}" for i in range(self.plan_items)]
+        return {
+            "goal_id": goal_id,
+            "day": day,
+            "topics": topics,
+            "learning_objectives": {topic: [f"Understand {topic}", f"Apply {topic}"] for topic in topics},
+            "practice_problems": [{"description": f"Exercise {i + 1}",
+                                   "difficulty_level": ("Easy", "Medium", "Hard")[i % 3]}
+                                  for i in range(self.plan_items)],
+            "resources": [f"Resource {i + 1}" for i in range(self.plan_items)],
+            "estimated_hours": 2.0,
+            "difficulty_level": "Medium",
+            "focus_areas": topics[:3]
+        }
+
+    def analytics(self) -> Dict[str, Any]:
+        logs = [entry for entries in self.progress.values() for entry in entries]
+        return {
+            "total_goals": len(self.goals),
+            "active_goals": sum(1 for goal in self.goals if goal["status"] == "active"),
+            "total_study_hours": sum(entry["hours_studied"] for entry in logs),
+            "average_confidence": sum(entry["confidence_level"] for entry in logs) / len(logs) if logs else 0.0,
+            "streak_days": len({entry["day"] for entry in logs}),
+            "completion_rate": 0.0,
+            "insights": ["Consistency is paying off - keep going!"]
+        }
+
+
+class StubBackendHandler(BaseHTTPRequestHandler):
+    """Request handler serving the stub backend routes"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive
+    # requests stall on delayed ACKs like no production server would
+    disable_nagle_algorithm = True
+    state: StubState = None
+    latency = 0.0
+    endpoint_latency: Dict[str, float] = {}
+    token_delay = 0.05
+    request_count = 0
+
+    def log_message(self, format: str, *args):
+        pass
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def _send_json(self, payload: Any, status: int = 200):
+        if msgpack is not None and "application/msgpack" in self.headers.get("Accept", ""):
+            body, content_type = msgpack.packb(payload), "application/msgpack"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        encoding = self._content_encoding(len(body))
+        if encoding == "br":
+            body = brotli.compress(body, quality=4)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Vary", "Accept, Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _content_encoding(self, size: int) -> Optional[str]:
+        """Pick br or gzip from Accept-Encoding for bodies worth compressing"""
+        if size < COMPRESSION_MIN_BYTES:
+            return None
+        accepted = {item.split(";")[0].strip() for item in self.headers.get("Accept-Encoding", "").split(",")}
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def _send_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _delay(self, name: str):
+        type(self).request_count += 1
+        time.sleep(self.endpoint_latency.get(name, self.latency))
+
+    def _authorized(self) -> bool:
+        if self.headers.get("Authorization", "").startswith("Bearer "):
+            return True
+        self._send_json({"detail": "Not authenticated"}, status=401)
+        return False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path, query = url.path, parse_qs(url.query)
+        state = self.state
+
+        if path == "/health":
+            self._delay("health")
+            return self._send_json({"status": "healthy"})
+        if path == "/auth/me":
+            self._delay("auth")
+            if self._authorized():
+                user = next(iter(state.users.values()))
+                self._send_json({k: v for k, v in user.items() if k != "password"})
+            return
+        if not self._authorized():
+            return
+
+        if path == "/goals":
+            self._delay("goals")
+            with state.lock:
+                goals = list(state.goals)
+            if "limit" not in query:
+                return self._send_json(goals)
+            # Paginated form: filter, then return one page and the filtered total
+            search = query.get("q", [""])[0].lower()
+            category = query.get("category", [""])[0]
+            goals = [goal for goal in goals
+                     if (not search or search in goal["title"].lower() or search in goal["description"].lower())
+                     and (not category or goal["category"] == category)]
+            limit = int(query["limit"][0])
+            offset = int(query.get("offset", ["0"])[0])
+            return self._send_json({"items": goals[offset:offset + limit], "total": len(goals),
+                                    "limit": limit, "offset": offset})
+        if path == "/analytics":
+            self._delay("analytics")
+            with state.lock:
+                return self._send_json(state.analytics())
+
+        match = re.fullmatch(r"/goals/(\d+)/plan/(\d+)", path)
+        if match:
+            self._delay("plan")
+            return self._send_json(state.plan(int(match.group(1)), int(match.group(2))))
+        match = re.fullmatch(r"/goals/(\d+)/progress", path)
+        if match:
+            self._delay("progress")
+            since_id = int(query.get("since_id", ["0"])[0])
+            with state.lock:
+                entries = [entry for entry in state.progress.get(int(match.group(1)), []) if entry["id"] > since_id]
+            return self._send_json(entries)
+        match = re.fullmatch(r"/goals/(\d+)", path)
+        if match:
+            self._delay("goals")
+            goal = self._find_goal(int(match.group(1)))
+            return self._send_json(goal) if goal else self._send_json({"detail": "Goal not found"}, status=404)
+
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        payload = self._read_json()
+        state = self.state
+
+        if path == "/auth/login":
+            self._delay("auth")
+            user = state.users.get(payload.get("email"))
+            if not user or user["password"] != payload.get("password"):
+                return self._send_json({"detail": "Incorrect email or password"}, status=401)
+            return self._send_json({"access_token": make_token(str(user["id"])), "token_type": "bearer"})
+        if path == "/auth/register":
+            self._delay("auth")
+            with state.lock:
+                if payload.get("email") in state.users:
+                    return self._send_json({"detail": "Email already registered"}, status=400)
+                user = dict(payload, id=len(state.users) + 1)
+                state.users[payload["email"]] = user
+            return self._send_json({k: v for k, v in user.items() if k != "password"})
+        if not self._authorized():
+            return
+
+        if path == "/goals":
+            self._delay("goals")
+            with state.lock:
+                goal = state.add_goal(payload["title"], payload["description"], payload["category"],
+                                      payload["target_days"])
+            return self._send_json(goal)
+        if path == "/progress":
+            self._delay("progress")
+            key = self.headers.get("Idempotency-Key")
+            with state.lock:
+                if key and key in state.idempotency_keys:
+                    return self._send_json(state.idempotency_keys[key])
+                entry = state.add_progress(payload)
+                result = dict(entry, ai_feedback="Great work - keep the streak going!")
+                if key:
+                    state.idempotency_keys[key] = result
+            return self._send_json(result)
+        if path == "/chat":
+            self._delay("chat")
+            return self._handle_chat(payload)
+
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_PUT(self):
+        path = urlparse(self.path).path
+        payload = self._read_json()
+        if not self._authorized():
+            return
+        match = re.fullmatch(r"/goals/(\d+)", path)
+        if match:
+            self._delay("goals")
+            with self.state.lock:
+                goal = self._find_goal(int(match.group(1)))
+                if goal:
+                    goal.update(payload, updated_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            return self._send_json(goal) if goal else self._send_json({"detail": "Goal not found"}, status=404)
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    def _find_goal(self, goal_id: int) -> Optional[Dict[str, Any]]:
+        return next((goal for goal in self.state.goals if goal["id"] == goal_id), None)
+
+    def _handle_chat(self, payload: Dict[str, Any]):
+        final = {
+            "response": CHAT_ANSWER,
+            "confidence": 85,
+            "suggestions": ["Review your notes from yesterday", "Try one harder problem"]
+        }
+        if not payload.get("stream") or "text/event-stream" not in self.headers.get("Accept", ""):
+            self._send_json(final)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in CHAT_ANSWER.split(" "):
+            event = {"type": "token", "content": word + " "}
+            self._send_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            time.sleep(self.token_delay)
+        done = dict(final, type="done")
+        self._send_chunk(f"data: {json.dumps(done)}\n\n".encode("utf-8"))
+        self._send_chunk(b"")
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8000, latency: float = 0.0,
+                token_delay: float = 0.05, endpoint_latency: Optional[Dict[str, float]] = None,
+                goals: int = 5, progress_entries: int = 30, plan_items: int = 5) -> ThreadingHTTPServer:
+    """Create a stub backend server; call serve_forever() to run it
+
+    endpoint_latency overrides latency per route group: health, auth, goals,
+    plan, progress, chat, analytics.
+    """
+    handler = type("ConfiguredStubBackendHandler", (StubBackendHandler,), {
+        "state": StubState(goals, progress_entries, plan_items),
+        "latency": latency,
+        "endpoint_latency": dict(endpoint_latency or {}),
+        "token_delay": token_delay
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(**kwargs) -> ThreadingHTTPServer:
+    """Start a stub backend on a background thread; port 0 picks a free port"""
+    kwargs.setdefault("port", 0)
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, name="stub-backend", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local stand-in backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="NAME=SECONDS",
+                        help="per-route latency, e.g. plan=1.5 (repeatable)")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="seconds between streamed chat tokens")
+    parser.add_argument("--goals", type=int, default=5, help="goals seeded for the demo user")
+    parser.add_argument("--progress-entries", type=int, default=30, help="progress logs seeded per goal")
+    parser.add_argument("--plan-items", type=int, default=5, help="topics/problems/resources per plan")
+    args = parser.parse_args()
+
+    endpoint_latency = {}
+    for item in args.endpoint_latency:
+        name, _, seconds = item.partition("=")
+        endpoint_latency[name] = float(seconds)
+
+    server = make_server(args.host, args.port, args.latency, args.token_delay, endpoint_latency,
+                         args.goals, args.progress_entries, args.plan_items)
+    print(f"Stub backend listening on http://{args.host}:{args.port} (login: demo@example.com / demo)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture
+def healthy():
+    return threading.Event()
+
+
+@pytest.fixture
+def breaker(healthy):
+    return CircuitBreaker(window=4, min_calls=2, error_rate=0.5, slow_call_rate=1.0,
+                          probe_interval=0.01, half_open_calls=1, probe=healthy.is_set)
+
+
+def test_opens_on_error_rate_and_rejects_calls(breaker):
+    breaker.record(failed=False)
+    breaker.record(failed=True)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("GET /goals")
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_open_half_open_reopen_close(breaker, healthy):
+    breaker.record(failed=True)
+    breaker.record(failed=True)
+    assert breaker.state == OPEN
+    prober = breaker._prober
+
+    healthy.set()
+    assert _wait_for(lambda: breaker.state == HALF_OPEN)
+    # The prober stays up while half-open, so a failed trial call is probed again
+    assert prober.is_alive()
+
+    breaker.before_call("GET /goals")
+    breaker.record(failed=True)
+    assert breaker.state == OPEN
+    assert _wait_for(lambda: breaker.state == HALF_OPEN)
+
+    breaker.before_call("GET /goals")
+    breaker.record(failed=False)
+    assert breaker.state == CLOSED
+    assert _wait_for(lambda: not prober.is_alive())
+    assert breaker._prober is None
+
+
+def test_release_frees_half_open_trial_slot(breaker, healthy):
+    healthy.set()
+    breaker.record(failed=True)
+    breaker.record(failed=True)
+    assert _wait_for(lambda: breaker.state == HALF_OPEN)
+
+    breaker.before_call("GET /goals")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("GET /goals")
+    breaker.release()
+    breaker.before_call("GET /goals")
+    assert breaker.state == HALF_OPEN
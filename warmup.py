@@ -0,0 +1,37 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from config import LOGIN_WARMUP_ENABLED
+from auth_manager import AuthManager
+from goals_manager import GoalsManager, bound_token
+from metrics import registry
+
+# Warm-ups mostly wait on fetch_concurrently workers, so a couple of threads cover bursts of logins
+_warmup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="login-warmup")
+
+
+def _warm_up(token: str, auth_manager: AuthManager, goals_manager: GoalsManager) -> Dict[str, Dict[str, Any]]:
+    """Fill the user, goals and analytics caches, then queue the current-day plans"""
+    with bound_token(token):
+        results = goals_manager.fetch_concurrently({
+            "user": lambda: auth_manager.get_current_user(token),
+            "goals": goals_manager.get_user_goals,
+            "analytics": goals_manager.get_analytics
+        })
+        plans = goals_manager.prefetch_current_plans() if results["goals"]["success"] else 0
+    for name, result in results.items():
+        registry.increment("login_warmup_total", {"step": name, "outcome": "ok" if result["success"] else "failed"})
+    registry.increment("login_warmup_plans_total", amount=plans)
+    return results
+
+
+def warm_up(token: str, auth_manager: AuthManager, goals_manager: GoalsManager) -> Optional[Future]:
+    """Start loading what the first pages after login need, without waiting for it
+
+    Runs in the background so the post-login rerun is not held up; calls the
+    first render makes while a warm-up fetch is still running join it through
+    request coalescing instead of fetching again. Returns None when disabled.
+    """
+    if not LOGIN_WARMUP_ENABLED:
+        return None
+    return _warmup_pool.submit(_warm_up, token, auth_manager, goals_manager)